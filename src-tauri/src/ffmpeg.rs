@@ -1,18 +1,32 @@
-use regex::Regex;
 use serde::{Deserialize, Serialize};
-use std::collections::HashMap;
+use std::collections::{HashMap, VecDeque};
 use std::fs;
-use std::path::Path;
-use std::process::{Command, Stdio};
-use std::sync::atomic::{AtomicBool, Ordering};
-use std::sync::Arc;
+use std::process::{Child, Command, Stdio};
+use std::sync::atomic::{AtomicBool, AtomicU64, AtomicUsize, Ordering};
+use std::sync::{Arc, Mutex, OnceLock};
 use std::time::Instant;
-use tauri::{AppHandle, Emitter, State};
+use tauri::{AppHandle, Emitter, Manager};
 
 use crate::models::{AudioTrack, Project, VideoClip};
 use crate::AppState;
 
 static CANCEL_FLAG: AtomicBool = AtomicBool::new(false);
+// Hardware doesn't change during a session: probed once, outside the processor lock so
+// duration lookups never wait behind the encoder tests
+static GPU_INFO: OnceLock<GpuInfo> = OnceLock::new();
+// Encoder and player of the preview being played: both killed by the next preview, so its
+// hardware encoder session is released and its window closes right away
+static PREVIEW: Mutex<Option<PreviewProcesses>> = Mutex::new(None);
+// Set while an export holds a hardware encoder session: previews fall back to libx264
+// rather than competing for the sessions consumer cards cap
+static GPU_EXPORT_RUNNING: AtomicBool = AtomicBool::new(false);
+static PREVIEW_GENERATION: AtomicU64 = AtomicU64::new(0);
+
+const MAX_PARALLEL_PROBES: usize = 8;
+const MAX_CACHED_DURATIONS: usize = 4096;
+const PREVIEW_MAX_HEIGHT: u32 = 720;
+const PREVIEW_POLL_INTERVAL: std::time::Duration = std::time::Duration::from_millis(200);
+const STALE_PREVIEW_AGE: std::time::Duration = std::time::Duration::from_secs(24 * 60 * 60);
 
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct GpuInfo {
@@ -39,17 +53,103 @@ pub struct Dependencies {
 }
 
 pub struct FFmpegProcessor {
-    duration_cache: HashMap<String, f64>,
-    available_gpu_encoder: Option<String>,
-    gpu_checked: bool,
+    // Read from disk on first probe, not while the window is being created
+    duration_cache: Option<DurationCache>,
+}
+
+// Bounded by evicting the oldest insertions first; persisted oldest-first so the order survives restarts
+#[derive(Default)]
+struct DurationCache {
+    durations: HashMap<String, f64>,
+    order: VecDeque<String>,
+}
+
+impl DurationCache {
+    fn get(&self, cache_key: &str) -> Option<&f64> {
+        self.durations.get(cache_key)
+    }
+
+    fn insert(&mut self, cache_key: String, duration: f64) {
+        if self.durations.contains_key(&cache_key) {
+            self.durations.insert(cache_key, duration);
+            return;
+        }
+        while self.durations.len() >= MAX_CACHED_DURATIONS {
+            let Some(oldest) = self.order.pop_front() else {
+                break;
+            };
+            self.durations.remove(&oldest);
+        }
+        self.order.push_back(cache_key.clone());
+        self.durations.insert(cache_key, duration);
+    }
+}
+
+fn encoder_name(gpu_type: &str) -> &'static str {
+    match gpu_type {
+        "nvidia" => "h264_nvenc",
+        "amd" => "h264_amf",
+        "intel" => "h264_qsv",
+        "vaapi" => "h264_vaapi",
+        _ => "libx264",
+    }
 }
 
 impl FFmpegProcessor {
     pub fn new() -> Self {
         Self {
-            duration_cache: HashMap::new(),
-            available_gpu_encoder: None,
-            gpu_checked: false,
+            duration_cache: None,
+        }
+    }
+
+    // Probed durations outlive the session: re-adding a file skips ffprobe until it changes on disk
+    fn duration_cache_path() -> std::path::PathBuf {
+        dirs::home_dir().unwrap_or_default().join(".video_musique_probe_cache.json")
+    }
+
+    // Stored as [key, duration] pairs, oldest first
+    fn load_duration_cache() -> DurationCache {
+        let entries: Vec<(String, f64)> = fs::read(Self::duration_cache_path())
+            .ok()
+            .and_then(|bytes| serde_json::from_slice(&bytes).ok())
+            .unwrap_or_default();
+
+        let mut cache = DurationCache::default();
+        for (cache_key, duration) in entries {
+            cache.insert(cache_key, duration);
+        }
+        cache
+    }
+
+    fn durations(&mut self) -> &mut DurationCache {
+        self.duration_cache.get_or_insert_with(Self::load_duration_cache)
+    }
+
+    // Written aside then renamed over the old file: a crash mid-write can't truncate the whole cache.
+    // The temp name carries the pid so two running instances never write into the same file
+    fn save_duration_cache(&self) {
+        let Some(cache) = &self.duration_cache else {
+            return;
+        };
+        let entries: Vec<(&str, f64)> = cache
+            .order
+            .iter()
+            .filter_map(|key| cache.durations.get(key).map(|&d| (key.as_str(), d)))
+            .collect();
+        let Ok(bytes) = serde_json::to_vec(&entries) else {
+            return;
+        };
+        let path = Self::duration_cache_path();
+        let tmp = path.with_extension(format!("json.{}.tmp", std::process::id()));
+        if fs::write(&tmp, bytes).is_ok() && fs::rename(&tmp, &path).is_err() {
+            let _ = fs::remove_file(&tmp);
+        }
+    }
+
+    // Failed probes (0.0) are retried next time rather than remembered
+    fn cache_duration(&mut self, cache_key: String, duration: f64) {
+        if duration > 0.0 {
+            self.durations().insert(cache_key, duration);
         }
     }
 
@@ -61,7 +161,7 @@ impl FFmpegProcessor {
             .unwrap_or(false)
     }
 
-    pub fn check_dependencies(&self) -> Dependencies {
+    pub fn check_dependencies() -> Dependencies {
         Dependencies {
             has_ffmpeg: Self::check_command_exists("ffmpeg"),
             has_ffprobe: Self::check_command_exists("ffprobe"),
@@ -69,6 +169,42 @@ impl FFmpegProcessor {
         }
     }
 
+    // A throwaway ffplay run pulls the player and its libraries into the OS file cache, so the
+    // first preview doesn't pay the cold start. A player parked in advance would already show its window
+    pub fn prewarm_player() {
+        let _ = Command::new("ffplay")
+            .arg("-version")
+            .stdout(Stdio::null())
+            .stderr(Stdio::null())
+            .status();
+    }
+
+    // Previews used to be written to the temp dir as preview_<pid>.mkv; leftovers are removed
+    pub fn cleanup_temp_files() {
+        let Ok(entries) = fs::read_dir(std::env::temp_dir()) else {
+            return;
+        };
+        let own_preview = format!("preview_{}.mkv", std::process::id());
+        for entry in entries.flatten() {
+            // Names first: the temp dir is shared, and only our own leftovers are worth a stat
+            let name = entry.file_name();
+            let name = name.to_string_lossy();
+            if !name.starts_with("preview_") || !name.ends_with(".mkv") || name == own_preview {
+                continue;
+            }
+            // Recent files may belong to another running instance
+            let is_stale = entry
+                .metadata()
+                .and_then(|m| m.modified())
+                .ok()
+                .and_then(|t| t.elapsed().ok())
+                .is_some_and(|age| age > STALE_PREVIEW_AGE);
+            if is_stale {
+                let _ = fs::remove_file(entry.path());
+            }
+        }
+    }
+
     fn test_gpu_encoder(encoder: &str, gpu_type: &str) -> bool {
         let mut cmd = Command::new("ffmpeg");
         cmd.args(["-hide_banner", "-f", "lavfi", "-i", "color=black:s=256x256:d=0.1"]);
@@ -84,13 +220,7 @@ impl FFmpegProcessor {
         cmd.status().map(|s| s.success()).unwrap_or(false)
     }
 
-    pub fn detect_gpu_encoder(&mut self) -> Option<String> {
-        if self.gpu_checked {
-            return self.available_gpu_encoder.clone();
-        }
-
-        self.gpu_checked = true;
-
+    fn probe_gpu_type() -> Option<String> {
         let output = Command::new("ffmpeg")
             .args(["-hide_banner", "-encoders"])
             .output()
@@ -105,56 +235,57 @@ impl FFmpegProcessor {
             ("vaapi", "h264_vaapi"),
         ];
 
-        for (gpu_type, encoder_name) in checks {
-            if encoders_output.contains(encoder_name) && Self::test_gpu_encoder(encoder_name, gpu_type) {
-                self.available_gpu_encoder = Some(gpu_type.to_string());
-                return Some(gpu_type.to_string());
-            }
-        }
-
-        None
+        checks
+            .into_iter()
+            .find(|(gpu_type, encoder_name)| encoders_output.contains(encoder_name) && Self::test_gpu_encoder(encoder_name, gpu_type))
+            .map(|(gpu_type, _)| gpu_type.to_string())
     }
 
-    pub fn get_gpu_info(&mut self) -> GpuInfo {
-        let gpu = self.detect_gpu_encoder();
-        let encoder = gpu.as_ref().map(|g| match g.as_str() {
-            "nvidia" => "h264_nvenc",
-            "amd" => "h264_amf",
-            "intel" => "h264_qsv",
-            "vaapi" => "h264_vaapi",
-            _ => "libx264",
-        });
+    pub fn detect_gpu_encoder() -> Option<String> {
+        Self::get_gpu_info().gpu_type.clone()
+    }
 
-        GpuInfo {
-            available: gpu.is_some(),
-            gpu_type: gpu,
-            encoder: encoder.map(String::from),
-        }
+    pub fn get_gpu_info() -> &'static GpuInfo {
+        GPU_INFO.get_or_init(|| {
+            let gpu = Self::probe_gpu_type();
+            GpuInfo {
+                available: gpu.is_some(),
+                encoder: gpu.as_deref().map(|g| encoder_name(g).to_string()),
+                gpu_type: gpu,
+            }
+        })
     }
 
-    fn get_cache_key(path: &str) -> String {
-        let mtime = fs::metadata(path)
-            .and_then(|m| m.modified())
-            .map(|t| t.duration_since(std::time::UNIX_EPOCH).unwrap_or_default().as_secs())
+    // None when the file is missing; nanosecond mtime plus size catch a rewrite within the same second
+    fn get_cache_key(path: &str) -> Option<String> {
+        let metadata = fs::metadata(path).ok()?;
+        let mtime = metadata
+            .modified()
+            .map(|t| t.duration_since(std::time::UNIX_EPOCH).unwrap_or_default().as_nanos())
             .unwrap_or(0);
-        format!("{}:{}", path, mtime)
+        Some(format!("{}:{}:{}", path, mtime, metadata.len()))
     }
 
-    fn duration_ffprobe_quick(path: &str) -> Option<f64> {
-        let output = Command::new("ffprobe")
-            .args(["-v", "error", "-show_entries", "format=duration", "-of", "default=nw=1:nk=1", path])
-            .output()
-            .ok()?;
-
-        let out = String::from_utf8_lossy(&output.stdout).trim().to_string();
-        if !out.is_empty() && out != "N/A" {
-            out.parse().ok()
-        } else {
-            None
+    // One stat per path, spread over a few threads: on network drives each is a round trip
+    fn get_cache_keys(paths: &[String]) -> Vec<Option<String>> {
+        if paths.len() < 2 {
+            return paths.iter().map(|p| Self::get_cache_key(p)).collect();
         }
+
+        let chunk_size = paths.len().div_ceil(MAX_PARALLEL_PROBES);
+        std::thread::scope(|scope| {
+            let handles: Vec<_> = paths
+                .chunks(chunk_size)
+                .map(|chunk| scope.spawn(move || chunk.iter().map(|p| Self::get_cache_key(p)).collect::<Vec<_>>()))
+                .collect();
+
+            handles.into_iter().flat_map(|h| h.join().unwrap()).collect()
+        })
     }
 
-    fn duration_ffprobe_json(path: &str) -> Option<f64> {
+    // One ffprobe run per file reads both the container and stream durations, so files without a
+    // container duration no longer need a second spawn
+    fn duration_ffprobe(path: &str) -> Option<f64> {
         let output = Command::new("ffprobe")
             .args(["-v", "error", "-print_format", "json", "-show_entries", "format=duration,stream=duration", path])
             .output()
@@ -183,126 +314,223 @@ impl FFmpegProcessor {
         None
     }
 
+    fn probe_duration(path: &str) -> f64 {
+        Self::duration_ffprobe(path).unwrap_or(0.0)
+    }
+
+    // A batch of one: the cache file is written by the batch, once
     pub fn get_duration(&mut self, path: &str) -> f64 {
-        if !Path::new(path).exists() {
-            return 0.0;
+        self.get_durations_parallel(vec![path.to_string()])[0]
+    }
+
+    pub fn get_durations_parallel(&mut self, paths: Vec<String>) -> Vec<f64> {
+        let mut durations = vec![0.0; paths.len()];
+        let mut misses: Vec<(usize, String)> = Vec::new();
+        // The same file dropped twice is probed once and copied to the other slots
+        let mut first_miss: HashMap<String, usize> = HashMap::new();
+        let mut repeats: Vec<(usize, usize)> = Vec::new();
+
+        for (i, cache_key) in Self::get_cache_keys(&paths).into_iter().enumerate() {
+            let Some(cache_key) = cache_key else {
+                continue;
+            };
+            if let Some(&duration) = self.durations().get(&cache_key) {
+                durations[i] = duration;
+            } else if let Some(&first) = first_miss.get(&cache_key) {
+                repeats.push((i, first));
+            } else {
+                first_miss.insert(cache_key.clone(), i);
+                misses.push((i, cache_key));
+            }
         }
 
-        let cache_key = Self::get_cache_key(path);
-        if let Some(&duration) = self.duration_cache.get(&cache_key) {
-            return duration;
+        // ffprobe runs are I/O bound: a few workers pull cache misses from a shared queue, so one
+        // slow file holds up only its own worker rather than a whole batch
+        let next = AtomicUsize::new(0);
+        let probed: Vec<(usize, f64)> = std::thread::scope(|scope| {
+            let handles: Vec<_> = (0..misses.len().min(MAX_PARALLEL_PROBES))
+                .map(|_| {
+                    scope.spawn(|| {
+                        let mut results = Vec::new();
+                        loop {
+                            let n = next.fetch_add(1, Ordering::Relaxed);
+                            let Some((i, _)) = misses.get(n) else {
+                                break;
+                            };
+                            results.push((n, Self::probe_duration(&paths[*i])));
+                        }
+                        results
+                    })
+                })
+                .collect();
+
+            handles.into_iter().flat_map(|h| h.join().unwrap_or_default()).collect()
+        });
+
+        for (n, duration) in probed {
+            let (i, cache_key) = &misses[n];
+            durations[*i] = duration;
+            self.cache_duration(cache_key.clone(), duration);
         }
 
-        let duration = Self::duration_ffprobe_quick(path)
-            .or_else(|| Self::duration_ffprobe_json(path))
-            .unwrap_or(0.0);
+        for (i, first) in repeats {
+            durations[i] = durations[first];
+        }
+        if !misses.is_empty() {
+            self.save_duration_cache();
+        }
 
-        self.duration_cache.insert(cache_key, duration);
-        duration
+        durations
     }
+}
 
-    pub fn get_durations_parallel(&mut self, paths: Vec<String>) -> Vec<f64> {
-        paths.iter().map(|p| self.get_duration(p)).collect()
-    }
+// Runs blocking processor work (ffprobe/ffmpeg spawns) on the blocking pool, off the UI thread
+async fn with_processor<T, F>(app: AppHandle, f: F) -> Result<T, String>
+where
+    T: Send + 'static,
+    F: FnOnce(&mut FFmpegProcessor) -> T + Send + 'static,
+{
+    tauri::async_runtime::spawn_blocking(move || {
+        let state = app.state::<AppState>();
+        let mut ffmpeg = state.ffmpeg.lock().unwrap();
+        f(&mut ffmpeg)
+    })
+    .await
+    .map_err(|e| e.to_string())
+}
+
+// Blocking work (ffmpeg runs, command assembly) never runs on an async worker
+async fn run_blocking<T, F>(f: F) -> Result<T, String>
+where
+    T: Send + 'static,
+    F: FnOnce() -> Result<T, String> + Send + 'static,
+{
+    tauri::async_runtime::spawn_blocking(f)
+        .await
+        .map_err(|e| e.to_string())?
 }
 
 // Tauri commands
 
 #[tauri::command]
-pub fn check_dependencies(state: State<'_, AppState>) -> Dependencies {
-    state.ffmpeg.lock().unwrap().check_dependencies()
+pub async fn check_dependencies() -> Result<Dependencies, String> {
+    tauri::async_runtime::spawn_blocking(FFmpegProcessor::check_dependencies)
+        .await
+        .map_err(|e| e.to_string())
 }
 
 #[tauri::command]
-pub fn detect_gpu_encoder(state: State<'_, AppState>) -> Option<String> {
-    state.ffmpeg.lock().unwrap().detect_gpu_encoder()
+pub async fn detect_gpu_encoder() -> Result<Option<String>, String> {
+    run_blocking(|| Ok(FFmpegProcessor::detect_gpu_encoder())).await
 }
 
 #[tauri::command]
-pub fn get_duration(state: State<'_, AppState>, path: String) -> f64 {
-    state.ffmpeg.lock().unwrap().get_duration(&path)
+pub async fn get_duration(app: AppHandle, path: String) -> Result<f64, String> {
+    with_processor(app, move |ffmpeg| ffmpeg.get_duration(&path)).await
 }
 
 #[tauri::command]
-pub fn get_durations_parallel(state: State<'_, AppState>, paths: Vec<String>) -> Vec<f64> {
-    state.ffmpeg.lock().unwrap().get_durations_parallel(paths)
+pub async fn get_durations_parallel(app: AppHandle, paths: Vec<String>) -> Result<Vec<f64>, String> {
+    with_processor(app, move |ffmpeg| ffmpeg.get_durations_parallel(paths)).await
 }
 
 #[tauri::command]
-pub fn get_gpu_info(state: State<'_, AppState>) -> GpuInfo {
-    state.ffmpeg.lock().unwrap().get_gpu_info()
+pub async fn get_gpu_info() -> Result<GpuInfo, String> {
+    run_blocking(|| Ok(FFmpegProcessor::get_gpu_info().clone())).await
 }
 
-fn get_encoder_config(gpu_type: &str) -> (&'static str, Option<&'static str>, HashMap<&'static str, &'static str>) {
-    let mut presets = HashMap::new();
+fn get_encoder_config(gpu_type: &str) -> (&'static str, Option<&'static str>) {
     match gpu_type {
-        "nvidia" => {
-            presets.insert("ultrafast", "p1");
-            presets.insert("fast", "p4");
-            presets.insert("balanced", "p5");
-            presets.insert("quality", "p7");
-            ("h264_nvenc", Some("-preset"), presets)
-        }
-        "amd" => {
-            presets.insert("ultrafast", "speed");
-            presets.insert("fast", "balanced");
-            presets.insert("balanced", "balanced");
-            presets.insert("quality", "quality");
-            ("h264_amf", Some("-quality"), presets)
-        }
-        "intel" => {
-            presets.insert("ultrafast", "veryfast");
-            presets.insert("fast", "fast");
-            presets.insert("balanced", "medium");
-            presets.insert("quality", "veryslow");
-            ("h264_qsv", Some("-preset"), presets)
-        }
-        "vaapi" => ("h264_vaapi", None, presets),
-        _ => {
-            presets.insert("ultrafast", "ultrafast");
-            presets.insert("fast", "veryfast");
-            presets.insert("balanced", "medium");
-            presets.insert("quality", "slow");
-            ("libx264", Some("-preset"), presets)
-        }
+        "nvidia" => ("h264_nvenc", Some("-preset")),
+        "amd" => ("h264_amf", Some("-quality")),
+        "intel" => ("h264_qsv", Some("-preset")),
+        "vaapi" => ("h264_vaapi", None),
+        _ => ("libx264", Some("-preset")),
     }
 }
 
-fn build_audio_crossfade_filter(tracks: &[AudioTrack], crossfade_duration: i32, base_input_index: usize) -> (String, String) {
+// Each encoder has its own preset vocabulary: the app presets come first, x264 names are accepted too
+fn translate_preset(preset: &str, gpu_type: &str) -> Option<&'static str> {
+    match gpu_type {
+        "nvidia" => match preset {
+            "quality" | "veryslow" | "slower" => Some("p7"),
+            "slow" => Some("p6"),
+            "balanced" | "medium" => Some("p5"),
+            "fast" => Some("p4"),
+            "faster" => Some("p3"),
+            "veryfast" => Some("p2"),
+            "ultrafast" | "superfast" => Some("p1"),
+            _ => None,
+        },
+        "amd" => match preset {
+            "quality" | "veryslow" | "slower" | "slow" => Some("quality"),
+            "balanced" | "medium" | "fast" => Some("balanced"),
+            "ultrafast" | "superfast" | "veryfast" | "faster" => Some("speed"),
+            _ => None,
+        },
+        "intel" => match preset {
+            "quality" | "veryslow" => Some("veryslow"),
+            "slower" => Some("slower"),
+            "slow" => Some("slow"),
+            "balanced" | "medium" => Some("medium"),
+            "fast" => Some("fast"),
+            "faster" => Some("faster"),
+            "ultrafast" | "superfast" | "veryfast" => Some("veryfast"),
+            _ => None,
+        },
+        "vaapi" => None,
+        // x264 ultrafast drops CABAC and deblocking: visible blocking for little time saved on a
+        // full export, so the fastest app preset stops at veryfast (previews bypass this)
+        _ => match preset {
+            "quality" | "slow" => Some("slow"),
+            "balanced" | "medium" => Some("medium"),
+            "fast" | "faster" => Some("faster"),
+            "ultrafast" | "veryfast" => Some("veryfast"),
+            "superfast" => Some("superfast"),
+            "slower" => Some("slower"),
+            "veryslow" => Some("veryslow"),
+            _ => None,
+        },
+    }
+}
+
+// qsin on both sides gives the equal-power pair: gain_out = cos(pi*n/2N), gain_in = sin(pi*n/2N)
+fn equal_power_crossfade(duration: impl std::fmt::Display) -> String {
+    format!("acrossfade=d={}:c1=qsin:c2=qsin", duration)
+}
+
+fn build_audio_crossfade_filter(tracks: &[&AudioTrack], crossfade_duration: i32, base_input_index: usize) -> (String, String) {
     let n = tracks.len();
     let mut parts: Vec<String> = tracks
         .iter()
         .enumerate()
-        .map(|(i, t)| {
-            let vol = if t.mute { 0.0 } else { t.volume.min(1.1) };
-            format!("[{}:a]volume={}[ma{}]", base_input_index + i, vol, i)
-        })
+        .map(|(i, t)| format!("[{}:a]volume={}[ma{}]", base_input_index + i, t.get_effective_volume(), i))
         .collect();
 
     if n == 1 {
         return (parts.join(";"), "[ma0]".to_string());
     }
 
+    let fade = equal_power_crossfade(crossfade_duration);
     let mut prev = "ma0".to_string();
     for j in 1..n {
         let cur = format!("ma{}", j);
         let out = format!("mx{}", j);
-        parts.push(format!(
-            "[{}][{}]acrossfade=d={}:c1=qsin:c2=qsin[{}]",
-            prev, cur, crossfade_duration, out
-        ));
+        parts.push(format!("[{}][{}]{}[{}]", prev, cur, fade, out));
         prev = out;
     }
 
     (parts.join(";"), format!("[{}]", prev))
 }
 
-fn build_video_crossfade_filter(clips: &[VideoClip], crossfade_duration: f64) -> (String, String, String) {
+fn build_video_crossfade_filter(clips: &[VideoClip], crossfade_duration: f64, max_height: Option<u32>) -> (String, String, String) {
     let n = clips.len();
     let mut parts: Vec<String> = Vec::new();
 
+    // Downscaling first means the crossfades and the encoder only ever see the smaller frames
+    let scale = max_height.map_or(String::new(), |h| format!("scale=-2:'min({},ih)',", h));
     for i in 0..n {
-        parts.push(format!("[{}:v]format=yuv420p,setsar=1[v{}]", i, i));
+        parts.push(format!("[{}:v]{}format=yuv420p,setsar=1[v{}]", i, scale, i));
         parts.push(format!("[{}:a]anull[va{}]", i, i));
     }
 
@@ -310,6 +538,14 @@ fn build_video_crossfade_filter(clips: &[VideoClip], crossfade_duration: f64) ->
         return (parts.join(";"), "[v0]".to_string(), "[va0]".to_string());
     }
 
+    // Hard cuts: one concat over all clips instead of a chain of zero-length transitions
+    if crossfade_duration <= 0.0 {
+        let inputs: String = (0..n).map(|i| format!("[v{}][va{}]", i, i)).collect();
+        parts.push(format!("{}concat=n={}:v=1:a=1[vcat][vacat]", inputs, n));
+        return (parts.join(";"), "[vcat]".to_string(), "[vacat]".to_string());
+    }
+
+    let fade = equal_power_crossfade(crossfade_duration);
     let mut acc = clips[0].duration;
     let mut prev_v = "v0".to_string();
     let mut prev_a = "va0".to_string();
@@ -322,10 +558,7 @@ fn build_video_crossfade_filter(clips: &[VideoClip], crossfade_duration: f64) ->
             "[{}][v{}]xfade=transition=fade:duration={}:offset={}[{}]",
             prev_v, j, crossfade_duration, off, vo
         ));
-        parts.push(format!(
-            "[{}][va{}]acrossfade=d={}:c1=qsin:c2=qsin[{}]",
-            prev_a, j, crossfade_duration, ao
-        ));
+        parts.push(format!("[{}][va{}]{}[{}]", prev_a, j, fade, ao));
         prev_v = vo;
         prev_a = ao;
         acc += (clips[j].duration - crossfade_duration).max(0.0);
@@ -335,36 +568,49 @@ fn build_video_crossfade_filter(clips: &[VideoClip], crossfade_duration: f64) ->
 }
 
 #[tauri::command]
-pub fn build_export_command(
-    state: State<'_, AppState>,
+pub async fn build_export_command(
     project: Project,
     output_path: String,
     preview_seconds: Option<i32>,
     use_gpu: bool,
     speed_preset: String,
+) -> Result<Vec<String>, String> {
+    let gpu_type = if use_gpu {
+        run_blocking(|| Ok(FFmpegProcessor::detect_gpu_encoder())).await?
+    } else {
+        None
+    };
+    // Filter graphs grow with every clip and track: assembled on a worker, not the main thread
+    run_blocking(move || Ok(build_command(&project, &output_path, preview_seconds, gpu_type.as_deref(), &speed_preset))).await
+}
+
+// Borrows the project so export/preview can build their command without copying it
+fn build_command(
+    project: &Project,
+    output_path: &str,
+    preview_seconds: Option<i32>,
+    gpu_type: Option<&str>,
+    speed_preset: &str,
 ) -> Vec<String> {
-    let mut ffmpeg = state.ffmpeg.lock().unwrap();
     let settings = &project.settings;
 
     let active_tracks: Vec<&AudioTrack> = if settings.include_music {
-        let solos: Vec<_> = project.audio_tracks.iter().filter(|t| t.solo).collect();
-        if !solos.is_empty() {
-            solos.into_iter().filter(|t| !t.mute).collect()
-        } else {
-            project.audio_tracks.iter().filter(|t| !t.mute).collect()
-        }
+        project.get_active_tracks()
     } else {
         vec![]
     };
 
     let video_volume = settings.video_volume / 100.0;
-    let gpu_type = if use_gpu { ffmpeg.detect_gpu_encoder() } else { None };
 
     let mut cmd = vec!["ffmpeg".to_string(), "-y".to_string()];
 
-    // Hardware acceleration flags
-    if let Some(ref gt) = gpu_type {
-        match gt.as_str() {
+    let is_webm = output_path.to_lowercase().ends_with(".webm");
+    let must_reencode = project.videos.len() > 1 || settings.video_crossfade > 0.0;
+
+    // Hardware decoding only pays off when video frames are actually decoded; a stream copy never is
+    let gpu_decode = if must_reencode || is_webm { gpu_type } else { None };
+    if let Some(gt) = gpu_decode {
+        match gt {
             "nvidia" => cmd.extend(["-hwaccel".to_string(), "cuda".to_string()]),
             "intel" => cmd.extend(["-hwaccel".to_string(), "qsv".to_string()]),
             "vaapi" => cmd.extend(["-vaapi_device".to_string(), "/dev/dri/renderD128".to_string()]),
@@ -380,19 +626,35 @@ pub fn build_export_command(
         cmd.extend(["-i".to_string(), t.path.clone()]);
     }
 
+    // A lone clip keeping its own audio unchanged is only remuxed: Matroska accepts any audio codec
+    let is_matroska = output_path == "-" || output_path.to_lowercase().ends_with(".mkv");
+    let copy_audio = !must_reencode
+        && is_matroska
+        && active_tracks.is_empty()
+        && settings.include_video_audio
+        && video_volume == 1.0;
+
     // Build filter complex
     let mut fc_parts: Vec<String> = Vec::new();
-    let must_reencode = project.videos.len() > 1 || settings.video_crossfade > 0.0;
 
-    let (vfc, tag_vout, tag_vaout) = build_video_crossfade_filter(&project.videos, settings.video_crossfade);
-    fc_parts.push(vfc);
-    fc_parts.push(format!("{}volume={}[va]", tag_vaout, video_volume));
+    let tag_vout = if must_reencode {
+        let max_height = preview_seconds.map(|_| PREVIEW_MAX_HEIGHT);
+        let (vfc, tag_vout, tag_vaout) = build_video_crossfade_filter(&project.videos, settings.video_crossfade, max_height);
+        fc_parts.push(vfc);
+        fc_parts.push(format!("{}volume={}[va]", tag_vaout, video_volume));
+        tag_vout
+    } else {
+        // A lone clip keeps its video stream untouched (filtered streams can't be stream-copied)
+        if settings.include_video_audio && !copy_audio {
+            fc_parts.push(format!("[0:a]volume={}[va]", video_volume));
+        }
+        "0:v:0".to_string()
+    };
 
     let mut tag_music = String::new();
     if !active_tracks.is_empty() {
         let base_idx = project.videos.len();
-        let owned_tracks: Vec<AudioTrack> = active_tracks.iter().map(|t| (*t).clone()).collect();
-        let (cf, tm) = build_audio_crossfade_filter(&owned_tracks, settings.audio_crossfade as i32, base_idx);
+        let (cf, tm) = build_audio_crossfade_filter(&active_tracks, settings.audio_crossfade as i32, base_idx);
         fc_parts.push(cf);
         tag_music = tm;
 
@@ -404,7 +666,9 @@ pub fn build_export_command(
     }
 
     // Audio mixing
-    let tag_final_audio = if settings.include_video_audio && !tag_music.is_empty() {
+    let tag_final_audio = if copy_audio {
+        "0:a?".to_string()
+    } else if settings.include_video_audio && !tag_music.is_empty() {
         fc_parts.push(format!(
             "[va]{}amix=inputs=2:duration=longest:dropout_transition=0[aout]",
             tag_music
@@ -423,7 +687,7 @@ pub fn build_export_command(
     }
 
     // Mapping
-    cmd.extend(["-map".to_string(), if !tag_vout.is_empty() { tag_vout } else { "0:v:0".to_string() }]);
+    cmd.extend(["-map".to_string(), tag_vout]);
     if !tag_final_audio.is_empty() {
         cmd.extend(["-map".to_string(), tag_final_audio]);
     } else {
@@ -431,105 +695,189 @@ pub fn build_export_command(
     }
 
     // Codecs
-    if output_path.to_lowercase().ends_with(".webm") {
+    if is_webm {
         cmd.extend(["-c:v".to_string(), "libvpx-vp9".to_string(), "-b:v".to_string(), "0".to_string(), "-crf".to_string(), "30".to_string()]);
         cmd.extend(["-c:a".to_string(), "libvorbis".to_string()]);
     } else {
         if must_reencode {
-            let effective_preset = if preview_seconds.is_some() { "ultrafast" } else { &speed_preset };
+            let effective_preset = if preview_seconds.is_some() { "ultrafast" } else { speed_preset };
+            // A 720p throwaway preview doesn't need export quality: a coarser target encodes faster
+            let quality = if preview_seconds.is_some() { "28" } else { "20" };
 
-            if let Some(ref gt) = gpu_type {
-                let (encoder, preset_flag, presets) = get_encoder_config(gt);
+            if let Some(gt) = gpu_type {
+                let (encoder, preset_flag) = get_encoder_config(gt);
                 cmd.extend(["-c:v".to_string(), encoder.to_string()]);
 
-                if let (Some(flag), Some(preset_val)) = (preset_flag, presets.get(effective_preset)) {
+                if let (Some(flag), Some(preset_val)) = (preset_flag, translate_preset(effective_preset, gt)) {
                     cmd.extend([flag.to_string(), preset_val.to_string()]);
                 }
 
-                match gt.as_str() {
-                    "nvidia" => cmd.extend(["-rc".to_string(), "vbr".to_string(), "-cq".to_string(), "20".to_string(), "-b:v".to_string(), "0".to_string()]),
-                    "amd" => cmd.extend(["-rc".to_string(), "vbr_latency".to_string(), "-qp_p".to_string(), "20".to_string(), "-qp_i".to_string(), "20".to_string()]),
-                    "intel" => cmd.extend(["-global_quality".to_string(), "20".to_string(), "-look_ahead".to_string(), "1".to_string()]),
-                    _ => cmd.extend(["-qp".to_string(), "20".to_string()]),
+                match gt {
+                    "nvidia" => {
+                        cmd.extend(["-rc".to_string(), "vbr".to_string(), "-cq".to_string(), quality.to_string(), "-b:v".to_string(), "0".to_string()]);
+                        // Previews are throwaway: low-latency tuning, and no B-frames to reorder
+                        if preview_seconds.is_some() {
+                            cmd.extend(["-tune".to_string(), "ll".to_string(), "-bf".to_string(), "0".to_string()]);
+                        }
+                    }
+                    "amd" => cmd.extend(["-rc".to_string(), "vbr_latency".to_string(), "-qp_p".to_string(), quality.to_string(), "-qp_i".to_string(), quality.to_string()]),
+                    "intel" => {
+                        let look_ahead = if preview_seconds.is_some() { "0" } else { "1" };
+                        cmd.extend(["-global_quality".to_string(), quality.to_string(), "-look_ahead".to_string(), look_ahead.to_string()]);
+                    }
+                    _ => cmd.extend(["-qp".to_string(), quality.to_string()]),
                 }
             } else {
-                let (encoder, preset_flag, presets) = get_encoder_config("cpu");
+                let (encoder, preset_flag) = get_encoder_config("cpu");
                 cmd.extend(["-c:v".to_string(), encoder.to_string()]);
-                if let (Some(flag), Some(preset_val)) = (preset_flag, presets.get(effective_preset)) {
+                let preset_val = if preview_seconds.is_some() { Some("ultrafast") } else { translate_preset(speed_preset, "cpu") };
+                if let (Some(flag), Some(preset_val)) = (preset_flag, preset_val) {
                     cmd.extend([flag.to_string(), preset_val.to_string()]);
                 }
-                cmd.extend(["-crf".to_string(), "20".to_string()]);
+                cmd.extend(["-crf".to_string(), quality.to_string()]);
             }
         } else {
             cmd.extend(["-c:v".to_string(), "copy".to_string()]);
         }
 
-        cmd.extend(["-c:a".to_string(), "aac".to_string(), "-b:a".to_string(), "192k".to_string()]);
+        if copy_audio {
+            cmd.extend(["-c:a".to_string(), "copy".to_string()]);
+        } else {
+            cmd.extend(["-c:a".to_string(), "aac".to_string(), "-b:a".to_string(), "192k".to_string()]);
+        }
     }
 
     if let Some(secs) = preview_seconds {
         cmd.extend(["-t".to_string(), secs.to_string()]);
     }
 
-    cmd.push(output_path);
+    cmd.push(output_path.to_string());
     cmd
 }
 
+// A partial export can be large, and on Windows its handle may linger briefly after the kill
+// (antivirus, indexer): removed in the background, retrying while access is denied
+fn remove_file_with_retry(path: &str) {
+    let mut delay = std::time::Duration::from_millis(50);
+    for _ in 0..5 {
+        match fs::remove_file(path) {
+            Err(e) if e.kind() == std::io::ErrorKind::PermissionDenied => {
+                std::thread::sleep(delay);
+                delay *= 2;
+            }
+            _ => return,
+        }
+    }
+}
+
+// Exports saturate every core: below-normal priority keeps the window responsive at almost no
+// cost to the encode. On Windows the console ffmpeg would otherwise open is suppressed too
+fn spawn_low_priority(cmd: &mut Command) -> std::io::Result<Child> {
+    #[cfg(windows)]
+    {
+        use std::os::windows::process::CommandExt;
+        const BELOW_NORMAL_PRIORITY_CLASS: u32 = 0x0000_4000;
+        const CREATE_NO_WINDOW: u32 = 0x0800_0000;
+        cmd.creation_flags(BELOW_NORMAL_PRIORITY_CLASS | CREATE_NO_WINDOW);
+    }
+
+    let child = cmd.spawn()?;
+
+    // Best effort: without renice the export simply runs at normal priority
+    #[cfg(unix)]
+    let _ = Command::new("renice")
+        .args(["-n", "10", "-p", &child.id().to_string()])
+        .stdout(Stdio::null())
+        .stderr(Stdio::null())
+        .status();
+
+    Ok(child)
+}
+
 #[tauri::command]
 pub async fn export_project(
     app: AppHandle,
-    state: State<'_, AppState>,
     project: Project,
     output_path: String,
     use_gpu: bool,
     speed_preset: String,
 ) -> Result<ExportResult, String> {
     CANCEL_FLAG.store(false, Ordering::SeqCst);
-    let start_time = Instant::now();
-
-    let gpu_type = {
-        let mut ffmpeg = state.ffmpeg.lock().unwrap();
-        if use_gpu { ffmpeg.detect_gpu_encoder() } else { None }
+    let gpu_type = if use_gpu {
+        run_blocking(|| Ok(FFmpegProcessor::detect_gpu_encoder())).await?
+    } else {
+        None
     };
 
-    let encoder = gpu_type.as_ref().map(|g| match g.as_str() {
-        "nvidia" => "h264_nvenc",
-        "amd" => "h264_amf",
-        "intel" => "h264_qsv",
-        "vaapi" => "h264_vaapi",
-        _ => "libx264",
-    }).unwrap_or("libx264");
-
-    let mut cmd = build_export_command(
-        state.clone(),
-        project.clone(),
-        output_path.clone(),
-        None,
-        use_gpu,
-        speed_preset,
-    );
+    run_blocking(move || {
+        let _gpu_export = gpu_type.is_some().then(GpuExportGuard::new);
+        run_export(&app, &project, &output_path, gpu_type.as_deref(), &speed_preset)
+    })
+    .await
+}
+
+// Holds GPU_EXPORT_RUNNING for its lifetime: cleared on drop, so a panicking export can't leave
+// every later preview on libx264
+struct GpuExportGuard;
+
+impl GpuExportGuard {
+    fn new() -> Self {
+        GPU_EXPORT_RUNNING.store(true, Ordering::SeqCst);
+        Self
+    }
+}
+
+impl Drop for GpuExportGuard {
+    fn drop(&mut self) {
+        GPU_EXPORT_RUNNING.store(false, Ordering::SeqCst);
+    }
+}
+
+fn run_export(
+    app: &AppHandle,
+    project: &Project,
+    output_path: &str,
+    gpu_type: Option<&str>,
+    speed_preset: &str,
+) -> Result<ExportResult, String> {
+    let start_time = Instant::now();
+    let encoder = gpu_type.map_or("libx264", encoder_name);
+
+    let mut cmd = build_command(project, output_path, None, gpu_type, speed_preset);
     cmd.extend(["-progress".to_string(), "pipe:1".to_string(), "-nostats".to_string()]);
 
-    let total_ms = project.get_video_duration() * 1000.0;
-    let time_regex = Regex::new(r"out_time_ms=(\d+)").unwrap();
+    let total_us = project.get_video_duration() * 1_000_000.0;
 
-    let mut child = Command::new(&cmd[0])
-        .args(&cmd[1..])
-        .stdout(Stdio::piped())
-        .stderr(Stdio::piped())
-        .spawn()
-        .map_err(|e| format!("Impossible de lancer ffmpeg: {}", e))?;
+    // stderr is never read: a pipe would stall ffmpeg once its buffer fills
+    let mut child = spawn_low_priority(
+        Command::new(&cmd[0])
+            .args(&cmd[1..])
+            .stdout(Stdio::piped())
+            .stderr(Stdio::null()),
+    )
+    .map_err(|e| format!("Impossible de lancer ffmpeg: {}", e))?;
 
     let stdout = child.stdout.take().unwrap();
-    let reader = std::io::BufReader::new(stdout);
+    let mut reader = std::io::BufReader::new(stdout);
+
+    // ffmpeg reports several times per second; only whole-percent changes reach the UI
+    let mut last_percent = -1;
 
+    // One line buffer for the whole run instead of a fresh String per progress line
     use std::io::BufRead;
-    for line in reader.lines().map_while(Result::ok) {
+    let mut line = String::new();
+    loop {
+        line.clear();
+        if !matches!(reader.read_line(&mut line), Ok(n) if n > 0) {
+            break;
+        }
+
         if CANCEL_FLAG.load(Ordering::SeqCst) {
             let _ = child.kill();
-            if Path::new(&output_path).exists() {
-                let _ = fs::remove_file(&output_path);
-            }
+            let _ = child.wait();
+            // No exists() check first: a missing file is just a failed remove
+            let partial = output_path.to_string();
+            tauri::async_runtime::spawn_blocking(move || remove_file_with_retry(&partial));
             return Ok(ExportResult {
                 success: false,
                 cancelled: true,
@@ -540,9 +888,18 @@ pub async fn export_project(
             });
         }
 
-        if let Some(caps) = time_regex.captures(&line) {
-            if let Ok(pos) = caps[1].parse::<f64>() {
-                let progress = (pos / total_ms * 100.0).min(100.0);
+        // -progress emits key=value lines; despite its name out_time_ms is in microseconds
+        let Some((key, value)) = line.split_once('=') else {
+            continue;
+        };
+        if total_us <= 0.0 || (key != "out_time_us" && key != "out_time_ms") {
+            continue;
+        }
+        if let Ok(pos) = value.trim().parse::<f64>() {
+            let progress = (pos / total_us * 100.0).clamp(0.0, 100.0);
+            let percent = progress as i32;
+            if percent != last_percent {
+                last_percent = percent;
                 let _ = app.emit("export-progress", progress);
             }
         }
@@ -565,44 +922,151 @@ pub fn cancel_export() {
     CANCEL_FLAG.store(true, Ordering::SeqCst);
 }
 
+// Generation tells a preview from the one that replaced it: pids can be reused once a player is reaped
+struct PreviewProcesses {
+    generation: u64,
+    // Taken by the relay once the stream ends, so its exit status is read outside the lock
+    encoder: Option<Child>,
+    player: Child,
+}
+
+fn stop_preview() {
+    if let Some(mut preview) = PREVIEW.lock().unwrap().take() {
+        for child in std::iter::once(&mut preview.player).chain(preview.encoder.as_mut()) {
+            let _ = child.kill();
+            let _ = child.wait();
+        }
+    }
+}
+
+// Matroska to ffplay's stdin: playback starts with the first cluster and nothing is written to disk
 #[tauri::command]
-pub async fn create_preview(
-    state: State<'_, AppState>,
+pub async fn stream_preview(
+    app: AppHandle,
     project: Project,
     clip_seconds: Option<i32>,
-) -> Result<String, String> {
-    let temp_dir = std::env::temp_dir();
-    let temp_path = temp_dir.join(format!("preview_{}.mkv", std::process::id()));
-    let temp_path_str = temp_path.to_string_lossy().to_string();
-
-    let cmd = build_export_command(
-        state,
-        project,
-        temp_path_str.clone(),
-        clip_seconds.or(Some(60)),
-        true,
-        "ultrafast".to_string(),
-    );
-
-    let status = Command::new(&cmd[0])
-        .args(&cmd[1..])
-        .stdout(Stdio::null())
-        .stderr(Stdio::null())
-        .status()
-        .map_err(|e| format!("Impossible de lancer ffmpeg: {}", e))?;
-
-    if status.success() {
-        Ok(temp_path_str)
+) -> Result<(), String> {
+    let gpu_type = if GPU_EXPORT_RUNNING.load(Ordering::SeqCst) {
+        None
     } else {
-        Err("La generation de la preview a echoue".to_string())
-    }
+        run_blocking(|| Ok(FFmpegProcessor::detect_gpu_encoder())).await?
+    };
+    let mut cmd = build_command(&project, "-", clip_seconds.or(Some(60)), gpu_type.as_deref(), "ultrafast");
+    cmd.insert(cmd.len() - 1, "-f".to_string());
+    cmd.insert(cmd.len() - 1, "matroska".to_string());
+
+    run_blocking(move || {
+        stop_preview();
+
+        let mut encoder = Command::new(&cmd[0])
+            .args(&cmd[1..])
+            .stdout(Stdio::piped())
+            .stderr(Stdio::null())
+            .spawn()
+            .map_err(|e| format!("Impossible de lancer ffmpeg: {}", e))?;
+        let mut stream = encoder.stdout.take().unwrap();
+
+        let mut player = match Command::new("ffplay")
+            .args(["-autoexit", "-loglevel", "quiet", "-window_title", "Preview", "-i", "-"])
+            .stdin(Stdio::piped())
+            .spawn()
+        {
+            Ok(player) => player,
+            Err(e) => {
+                let _ = encoder.kill();
+                let _ = encoder.wait();
+                return Err(format!("Impossible de lancer ffplay: {}", e));
+            }
+        };
+        let mut sink = player.stdin.take().unwrap();
+
+        let generation = PREVIEW_GENERATION.fetch_add(1, Ordering::SeqCst) + 1;
+        *PREVIEW.lock().unwrap() = Some(PreviewProcesses { generation, encoder: Some(encoder), player });
+
+        // One blocking-pool task relays the stream and reaps both processes, holding its thread for the
+        // whole preview. The stream is relayed rather than handed over so the side that ended it is known:
+        // ffplay exits 0 even when its input breaks off. A failed write means the player was closed first
+        // and the encoder only died of the broken pipe; the end of the stream means the encoder finished
+        // and its status counts
+        tauri::async_runtime::spawn_blocking(move || {
+            let player_closed = std::io::copy(&mut stream, &mut sink).is_err();
+
+            // Taken before the player can see the end of its input; None if a newer preview stopped this one
+            let encoder = match PREVIEW.lock().unwrap().as_mut() {
+                Some(preview) if preview.generation == generation => preview.encoder.take(),
+                _ => None,
+            };
+            drop(stream);
+            drop(sink);
+            let Some(mut encoder) = encoder else {
+                return;
+            };
+
+            let failed = matches!(encoder.wait(), Ok(status) if !status.success());
+            if failed && !player_closed {
+                let _ = app.emit("preview-error", "La generation de la preview a echoue");
+            }
+
+            // The player stays in PREVIEW so a newer preview can still close it: polled, with the lock held
+            // only for each check
+            loop {
+                {
+                    let mut slot = PREVIEW.lock().unwrap();
+                    match slot.as_mut() {
+                        Some(preview) if preview.generation == generation => {
+                            if !matches!(preview.player.try_wait(), Ok(None)) {
+                                slot.take();
+                                return;
+                            }
+                        }
+                        // Stopped and reaped by a newer preview
+                        _ => return,
+                    }
+                }
+                std::thread::sleep(PREVIEW_POLL_INTERVAL);
+            }
+        });
+        Ok(())
+    })
+    .await
 }
 
-#[tauri::command]
-pub fn play_preview(path: String) -> Result<(), String> {
-    Command::new("ffplay")
-        .args(["-autoexit", "-loglevel", "quiet", "-window_title", "Preview", &path])
-        .spawn()
-        .map_err(|e| format!("Impossible de lancer ffplay: {}", e))?;
-    Ok(())
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn out_of_range_track_volume_is_clamped_in_the_filter() {
+        let mut project = Project::default();
+        project.videos.push(VideoClip { path: "/clips/a.mp4".into(), name: "a.mp4".into(), duration: 30.0 });
+        project.audio_tracks.push(AudioTrack {
+            path: "/music/loud.mp3".into(),
+            volume: 5.0,
+            name: "loud.mp3".into(),
+            duration: 30.0,
+            mute: false,
+            solo: false,
+        });
+        project.settings.include_music = true;
+
+        let cmd = build_command(&project, "out.mkv", None, None, "balanced");
+        let filter = cmd.iter().find(|arg| arg.contains("volume=")).expect("no audio filter");
+        assert!(filter.contains("volume=1.1"), "{}", filter);
+        assert!(!filter.contains("volume=5"), "{}", filter);
+    }
+
+    #[test]
+    fn full_duration_cache_evicts_the_oldest_entry() {
+        let mut cache = DurationCache::default();
+        for i in 0..MAX_CACHED_DURATIONS {
+            cache.insert(format!("clip{}", i), 1.0);
+        }
+        cache.insert("clip0".into(), 2.0);
+        cache.insert("new".into(), 3.0);
+
+        assert_eq!(cache.durations.len(), MAX_CACHED_DURATIONS);
+        assert_eq!(cache.get("clip0"), None);
+        assert_eq!(cache.get("clip1"), Some(&1.0));
+        assert_eq!(cache.get("new"), Some(&3.0));
+    }
 }
@@ -18,6 +18,13 @@ pub fn run() {
             app.manage(AppState {
                 ffmpeg: Mutex::new(ffmpeg::FFmpegProcessor::new()),
             });
+            // Not needed for the first paint
+            std::thread::spawn(ffmpeg::FFmpegProcessor::cleanup_temp_files);
+            // Warm the GPU probe and the player so the first export or preview doesn't pay for them
+            std::thread::spawn(|| {
+                ffmpeg::FFmpegProcessor::get_gpu_info();
+                ffmpeg::FFmpegProcessor::prewarm_player();
+            });
             Ok(())
         })
         .invoke_handler(tauri::generate_handler![
@@ -28,8 +35,7 @@ pub fn run() {
             ffmpeg::get_gpu_info,
             ffmpeg::build_export_command,
             ffmpeg::export_project,
-            ffmpeg::create_preview,
-            ffmpeg::play_preview,
+            ffmpeg::stream_preview,
             ffmpeg::cancel_export,
             models::save_project,
             models::load_project,
@@ -21,12 +21,26 @@ fn default_volume() -> f64 {
     1.0
 }
 
+pub const MAX_TRACK_VOLUME: f64 = 1.1;
+
+// Positional forms (path, volume, name, duration, mute, solo), serialized as arrays without keys
+pub type AudioTrackTuple = (String, f64, String, f64, bool, bool);
+
 impl AudioTrack {
+    pub fn to_tuple(&self) -> (&str, f64, &str, f64, bool, bool) {
+        (&self.path, self.volume, &self.name, self.duration, self.mute, self.solo)
+    }
+
+    pub fn from_tuple((path, volume, name, duration, mute, solo): AudioTrackTuple) -> Self {
+        Self { path, volume, name, duration, mute, solo }
+    }
+
+    // Projects also arrive through IPC payloads and decoded snapshots: the filter never trusts the field
     pub fn get_effective_volume(&self) -> f64 {
         if self.mute {
             0.0
         } else {
-            self.volume.min(1.1)
+            self.volume.clamp(0.0, MAX_TRACK_VOLUME)
         }
     }
 }
@@ -40,6 +54,18 @@ pub struct VideoClip {
     pub duration: f64,
 }
 
+pub type VideoClipTuple = (String, String, f64);
+
+impl VideoClip {
+    pub fn to_tuple(&self) -> (&str, &str, f64) {
+        (&self.path, &self.name, self.duration)
+    }
+
+    pub fn from_tuple((path, name, duration): VideoClipTuple) -> Self {
+        Self { path, name, duration }
+    }
+}
+
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct ProjectSettings {
     #[serde(default = "default_true")]
@@ -85,7 +111,39 @@ impl Default for ProjectSettings {
     }
 }
 
-#[derive(Debug, Clone, Serialize, Deserialize)]
+pub type ProjectSettingsTuple = (bool, bool, f64, f64, bool, f64, f64, bool, String);
+
+impl ProjectSettings {
+    pub fn to_tuple(&self) -> (bool, bool, f64, f64, bool, f64, f64, bool, &str) {
+        (
+            self.include_video_audio,
+            self.include_music,
+            self.audio_crossfade,
+            self.video_crossfade,
+            self.cut_music_at_end,
+            self.video_volume,
+            self.music_volume,
+            self.use_gpu,
+            &self.speed_preset,
+        )
+    }
+
+    pub fn from_tuple(t: ProjectSettingsTuple) -> Self {
+        Self {
+            include_video_audio: t.0,
+            include_music: t.1,
+            audio_crossfade: t.2,
+            video_crossfade: t.3,
+            cut_music_at_end: t.4,
+            video_volume: t.5,
+            music_volume: t.6,
+            use_gpu: t.7,
+            speed_preset: t.8,
+        }
+    }
+}
+
+#[derive(Debug, Clone, Default, Serialize, Deserialize)]
 pub struct Project {
     #[serde(default)]
     pub videos: Vec<VideoClip>,
@@ -95,42 +153,113 @@ pub struct Project {
     pub settings: ProjectSettings,
 }
 
-impl Default for Project {
-    fn default() -> Self {
+fn base_name(path: &str) -> &str {
+    path.rsplit(['/', '\\']).find(|s| !s.is_empty()).unwrap_or(path)
+}
+
+pub type ProjectTuple = (Vec<VideoClipTuple>, Vec<AudioTrackTuple>, ProjectSettingsTuple);
+
+// Versioned positional layout used by binary snapshots
+pub const PACKED_FORMAT_VERSION: u32 = 1;
+pub type PackedProject = (u32, Vec<VideoClipTuple>, Vec<AudioTrackTuple>, ProjectSettingsTuple);
+
+impl Project {
+    #[allow(clippy::type_complexity)]
+    pub fn to_tuple(
+        &self,
+    ) -> (
+        Vec<(&str, &str, f64)>,
+        Vec<(&str, f64, &str, f64, bool, bool)>,
+        (bool, bool, f64, f64, bool, f64, f64, bool, &str),
+    ) {
+        (
+            self.videos.iter().map(VideoClip::to_tuple).collect(),
+            self.audio_tracks.iter().map(AudioTrack::to_tuple).collect(),
+            self.settings.to_tuple(),
+        )
+    }
+
+    pub fn from_tuple((videos, audio_tracks, settings): ProjectTuple) -> Self {
         Self {
-            videos: Vec::new(),
-            audio_tracks: Vec::new(),
-            settings: ProjectSettings::default(),
+            videos: videos.into_iter().map(VideoClip::from_tuple).collect(),
+            audio_tracks: audio_tracks.into_iter().map(AudioTrack::from_tuple).collect(),
+            settings: ProjectSettings::from_tuple(settings),
         }
     }
-}
 
-impl Project {
-    pub fn get_active_tracks(&self) -> Vec<&AudioTrack> {
-        if self.audio_tracks.is_empty() {
-            return vec![];
+    #[allow(clippy::type_complexity)]
+    pub fn to_packed(
+        &self,
+    ) -> (
+        u32,
+        Vec<(&str, &str, f64)>,
+        Vec<(&str, f64, &str, f64, bool, bool)>,
+        (bool, bool, f64, f64, bool, f64, f64, bool, &str),
+    ) {
+        let (videos, audio_tracks, settings) = self.to_tuple();
+        (PACKED_FORMAT_VERSION, videos, audio_tracks, settings)
+    }
+
+    pub fn from_packed((version, videos, audio_tracks, settings): PackedProject) -> Result<Self, String> {
+        if version != PACKED_FORMAT_VERSION {
+            return Err(format!("Version de sauvegarde non supportee: {}", version));
         }
+        let mut project = Self::from_tuple((videos, audio_tracks, settings));
+        project.clamp_volumes();
+        Ok(project)
+    }
 
-        let solos: Vec<_> = self.audio_tracks.iter().filter(|t| t.solo).collect();
-        if !solos.is_empty() {
-            solos.into_iter().filter(|t| !t.mute).collect()
-        } else {
-            self.audio_tracks.iter().filter(|t| !t.mute).collect()
+    // Compact binary snapshot; user-visible saves stay JSON. No command uses it yet
+    #[allow(dead_code)]
+    pub fn to_cbor(&self) -> Result<Vec<u8>, String> {
+        let mut buf = Vec::new();
+        ciborium::ser::into_writer(&self.to_packed(), &mut buf).map_err(|e| e.to_string())?;
+        Ok(buf)
+    }
+
+    #[allow(dead_code)]
+    pub fn from_cbor(bytes: &[u8]) -> Result<Self, String> {
+        let packed: PackedProject = ciborium::de::from_reader(bytes).map_err(|e| e.to_string())?;
+        Self::from_packed(packed)
+    }
+
+    // Older project files may omit names; derive them once for every entry at load time
+    pub fn fill_missing_names(&mut self) {
+        let videos = self.videos.iter_mut().map(|v| (&v.path, &mut v.name));
+        let tracks = self.audio_tracks.iter_mut().map(|t| (&t.path, &mut t.name));
+        for (path, name) in videos.chain(tracks).filter(|(_, name)| name.is_empty()) {
+            *name = base_name(path).to_string();
         }
     }
 
+    pub fn clamp_volumes(&mut self) {
+        for t in &mut self.audio_tracks {
+            t.volume = t.volume.clamp(0.0, MAX_TRACK_VOLUME);
+        }
+    }
+
+    // Audible tracks: not muted, and soloed whenever any track is soloed
+    fn audible_tracks(&self) -> impl Iterator<Item = &AudioTrack> {
+        let any_solo = self.audio_tracks.iter().any(|t| t.solo);
+        self.audio_tracks.iter().filter(move |t| !t.mute && (t.solo || !any_solo))
+    }
+
+    pub fn get_active_tracks(&self) -> Vec<&AudioTrack> {
+        self.audible_tracks().collect()
+    }
+
     pub fn get_video_duration(&self) -> f64 {
-        if self.videos.is_empty() {
+        let n = self.videos.len();
+        if n == 0 {
             return 0.0;
         }
 
         let base: f64 = self.videos.iter().map(|v| v.duration).sum();
-        let overlap = self.settings.video_crossfade * (self.videos.len() as f64 - 1.0).max(0.0);
-        (base - overlap).max(0.0)
+        (base - self.settings.video_crossfade * (n - 1) as f64).max(0.0)
     }
 
     pub fn get_music_duration(&self) -> f64 {
-        self.get_active_tracks().iter().map(|t| t.duration).sum()
+        self.audible_tracks().map(|t| t.duration).sum()
     }
 }
 
@@ -189,28 +318,26 @@ fn get_config_path() -> PathBuf {
 // Tauri commands
 
 #[tauri::command]
-pub fn save_project(project: Project, file_path: String) -> Result<(), String> {
+pub async fn save_project(project: Project, file_path: String) -> Result<(), String> {
     let json = serde_json::to_string_pretty(&project).map_err(|e| e.to_string())?;
     fs::write(&file_path, json).map_err(|e| format!("Impossible de sauvegarder le projet: {}", e))
 }
 
 #[tauri::command]
-pub fn load_project(file_path: String) -> Result<Project, String> {
-    let content = fs::read_to_string(&file_path).map_err(|e| format!("Impossible de charger le projet: {}", e))?;
-    serde_json::from_str(&content).map_err(|e| format!("Format de projet invalide: {}", e))
+pub async fn load_project(file_path: String) -> Result<Project, String> {
+    let content = fs::read(&file_path).map_err(|e| format!("Impossible de charger le projet: {}", e))?;
+    let mut project: Project = serde_json::from_slice(&content).map_err(|e| format!("Format de projet invalide: {}", e))?;
+    project.fill_missing_names();
+    project.clamp_volumes();
+    Ok(project)
 }
 
 #[tauri::command]
 pub fn get_config() -> Config {
-    let config_path = get_config_path();
-    if config_path.exists() {
-        fs::read_to_string(&config_path)
-            .ok()
-            .and_then(|s| serde_json::from_str(&s).ok())
-            .unwrap_or_default()
-    } else {
-        Config::default()
-    }
+    fs::read(get_config_path())
+        .ok()
+        .and_then(|b| serde_json::from_slice(&b).ok())
+        .unwrap_or_default()
 }
 
 #[tauri::command]
@@ -219,3 +346,52 @@ pub fn set_config(config: Config) -> Result<(), String> {
     let json = serde_json::to_string_pretty(&config).map_err(|e| e.to_string())?;
     fs::write(&config_path, json).map_err(|e| format!("Impossible de sauvegarder la configuration: {}", e))
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn cbor_round_trip() {
+        let mut project = Project::default();
+        project.videos.push(VideoClip { path: "/clips/a.mp4".into(), name: "a.mp4".into(), duration: 3.5 });
+        project.audio_tracks.push(AudioTrack {
+            path: "C:\\music\\b.mp3".into(),
+            volume: 0.8,
+            name: "b.mp3".into(),
+            duration: 120.25,
+            mute: true,
+            solo: false,
+        });
+        project.settings.video_crossfade = 0.5;
+
+        let decoded = Project::from_cbor(&project.to_cbor().unwrap()).unwrap();
+        assert_eq!(decoded.to_tuple(), project.to_tuple());
+    }
+
+    #[test]
+    fn decoded_volumes_are_clamped() {
+        let mut project = Project::default();
+        project.audio_tracks.push(AudioTrack {
+            path: "/music/loud.mp3".into(),
+            volume: 5.0,
+            name: "loud.mp3".into(),
+            duration: 10.0,
+            mute: false,
+            solo: false,
+        });
+
+        let decoded = Project::from_cbor(&project.to_cbor().unwrap()).unwrap();
+        assert_eq!(decoded.audio_tracks[0].volume, MAX_TRACK_VOLUME);
+        assert_eq!(project.audio_tracks[0].get_effective_volume(), MAX_TRACK_VOLUME);
+    }
+
+    #[test]
+    fn cbor_rejects_other_versions() {
+        let project = Project::default();
+        let (_, videos, audio_tracks, settings) = project.to_packed();
+        let mut bytes = Vec::new();
+        ciborium::ser::into_writer(&(PACKED_FORMAT_VERSION + 1, videos, audio_tracks, settings), &mut bytes).unwrap();
+        assert!(Project::from_cbor(&bytes).is_err());
+    }
+}
@@ -1,5 +1,6 @@
 import { useEffect } from 'react';
 import { listen } from '@tauri-apps/api/event';
+import { useShallow } from 'zustand/react/shallow';
 import { useStore } from './store/useStore';
 import Header from './components/Header';
 import VideoPanel from './components/VideoPanel';
@@ -8,23 +9,92 @@ import SettingsPanel from './components/SettingsPanel';
 import ExportPanel from './components/ExportPanel';
 import StatusBar from './components/StatusBar';
 
+// Nothing can be dropped before the window is shown
+const DRAG_DROP_SETUP_DELAY_MS = 50;
+
 function App() {
-  const { checkDependencies, detectGpu, setExportProgress, dependencies } = useStore();
+  const {
+    checkDependencies,
+    detectGpu,
+    setExportProgress,
+    setStatusMessage,
+    addMediaFiles,
+    setDraggingFiles,
+    dependencies,
+  } = useStore(
+    useShallow((s) => ({
+      checkDependencies: s.checkDependencies,
+      detectGpu: s.detectGpu,
+      setExportProgress: s.setExportProgress,
+      setStatusMessage: s.setStatusMessage,
+      addMediaFiles: s.addMediaFiles,
+      setDraggingFiles: s.setDraggingFiles,
+      dependencies: s.dependencies,
+    }))
+  );
 
   useEffect(() => {
     // Initialize
     checkDependencies();
     detectGpu();
 
-    // Listen for export progress
+    // Listen for export progress: at most one store update per frame
+    let pendingProgress: number | null = null;
+    let progressFrame = 0;
     const unlisten = listen<number>('export-progress', (event) => {
-      setExportProgress(event.payload);
+      if (pendingProgress === null) {
+        progressFrame = requestAnimationFrame(() => {
+          if (pendingProgress !== null) setExportProgress(pendingProgress);
+          pendingProgress = null;
+        });
+      }
+      pendingProgress = event.payload;
+    });
+
+    // Streamed previews report encoder failures after the command has returned
+    const unlistenPreview = listen<string>('preview-error', (event) => {
+      setStatusMessage(event.payload);
     });
 
     return () => {
       unlisten.then((fn) => fn());
+      cancelAnimationFrame(progressFrame);
+      unlistenPreview.then((fn) => fn());
+    };
+  }, [checkDependencies, detectGpu, setExportProgress, setStatusMessage]);
+
+  // Files dropped anywhere on the window: the webview module is loaded after the first paint
+  useEffect(() => {
+    let disposed = false;
+    let unlistenDrop: (() => void) | null = null;
+
+    const timer = setTimeout(async () => {
+      try {
+        const { getCurrentWebview } = await import('@tauri-apps/api/webview');
+        // Enter/leave drive the drop zones' highlight; 'over' repeats with every pointer move
+        const unlisten = await getCurrentWebview().onDragDropEvent((event) => {
+          if (event.payload.type === 'enter') {
+            setDraggingFiles(true);
+          } else if (event.payload.type === 'leave') {
+            setDraggingFiles(false);
+          } else if (event.payload.type === 'drop') {
+            setDraggingFiles(false);
+            addMediaFiles(event.payload.paths);
+          }
+        });
+        if (disposed) unlisten();
+        else unlistenDrop = unlisten;
+      } catch (error) {
+        console.error('Erreur lors de l\'activation du glisser-deposer:', error);
+      }
+    }, DRAG_DROP_SETUP_DELAY_MS);
+
+    return () => {
+      disposed = true;
+      clearTimeout(timer);
+      unlistenDrop?.();
     };
-  }, [checkDependencies, detectGpu, setExportProgress]);
+  }, [addMediaFiles, setDraggingFiles]);
 
   // Check if FFmpeg is available
   if (dependencies && !dependencies.has_ffmpeg) {
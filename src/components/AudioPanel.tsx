@@ -1,29 +1,164 @@
-import { useCallback } from 'react';
+import { memo, useEffect, useRef, useState } from 'react';
 import { open } from '@tauri-apps/plugin-dialog';
+import { useShallow } from 'zustand/react/shallow';
 import { useStore } from '../store/useStore';
-import { formatDuration, getMusicDuration, SUPPORTED_AUDIO_EXTENSIONS } from '../types';
+import {
+  AudioTrack,
+  formatDuration,
+  getItemKey,
+  getMusicDuration,
+  SUPPORTED_AUDIO_EXTENSIONS,
+} from '../types';
+
+const VOLUME_COMMIT_DELAY_MS = 50;
+
+const audioFilters = [
+  {
+    name: 'Fichiers audio',
+    extensions: SUPPORTED_AUDIO_EXTENSIONS.map((e) => e.slice(1)),
+  },
+];
+const audioFormats = SUPPORTED_AUDIO_EXTENSIONS.join(', ');
+
+interface AudioTrackItemProps {
+  track: AudioTrack;
+  index: number;
+  isLast: boolean;
+}
+
+// Memoized: adding, removing or moving a track only re-renders the rows whose props changed
+const AudioTrackItem = memo(function AudioTrackItem({ track, index, isLast }: AudioTrackItemProps) {
+  const { removeAudioTrack, updateAudioTrack, moveAudioTrack } = useStore(
+    useShallow((s) => ({
+      removeAudioTrack: s.removeAudioTrack,
+      updateAudioTrack: s.updateAudioTrack,
+      moveAudioTrack: s.moveAudioTrack,
+    }))
+  );
+
+  // The slider moves a local value; the store sees at most one volume write per 50 ms and one on release
+  const [volume, setVolume] = useState(track.volume);
+  const pendingVolume = useRef<number | null>(null);
+  const volumeTimer = useRef<ReturnType<typeof setTimeout> | null>(null);
+  const currentIndex = useRef(index);
+  currentIndex.current = index;
+
+  useEffect(() => {
+    if (pendingVolume.current === null) setVolume(track.volume);
+  }, [track.volume]);
+
+  useEffect(
+    () => () => {
+      if (volumeTimer.current) clearTimeout(volumeTimer.current);
+    },
+    []
+  );
+
+  const commitVolume = () => {
+    if (volumeTimer.current) {
+      clearTimeout(volumeTimer.current);
+      volumeTimer.current = null;
+    }
+    if (pendingVolume.current !== null) {
+      updateAudioTrack(currentIndex.current, { volume: pendingVolume.current });
+      pendingVolume.current = null;
+    }
+  };
+
+  const handleVolumeChange = (value: number) => {
+    setVolume(value);
+    pendingVolume.current = value;
+    if (!volumeTimer.current) {
+      volumeTimer.current = setTimeout(commitVolume, VOLUME_COMMIT_DELAY_MS);
+    }
+  };
+
+  return (
+    <div className={`media-item group ${track.mute ? 'opacity-50' : ''}`}>
+      <div className="flex flex-col gap-1">
+        <button
+          onClick={() => moveAudioTrack(index, index - 1)}
+          disabled={index === 0}
+          className="text-gray-500 hover:text-white disabled:opacity-30 text-xs"
+        >
+          &#9650;
+        </button>
+        <button
+          onClick={() => moveAudioTrack(index, index + 1)}
+          disabled={isLast}
+          className="text-gray-500 hover:text-white disabled:opacity-30 text-xs"
+        >
+          &#9660;
+        </button>
+      </div>
+
+      <div className="w-8 h-8 bg-accent-success/20 rounded flex items-center justify-center text-accent-success">
+        &#9835;
+      </div>
+
+      <div className="flex-1 min-w-0">
+        <p className="text-sm font-medium truncate">{track.name}</p>
+        <p className="text-xs text-gray-400">{formatDuration(track.duration)}</p>
+      </div>
+
+      {/* Volume slider */}
+      <div className="flex items-center gap-2 w-32">
+        <input
+          type="range"
+          min="0"
+          max="110"
+          value={volume * 100}
+          onChange={(e) => handleVolumeChange(e.target.valueAsNumber / 100)}
+          onPointerUp={commitVolume}
+          className="slider flex-1"
+        />
+        <span className="text-xs text-gray-400 w-8">{Math.round(volume * 100)}%</span>
+      </div>
+
+      {/* Mute button */}
+      <button
+        onClick={() => updateAudioTrack(index, { mute: !track.mute })}
+        className={`toggle-btn ${track.mute ? 'active bg-accent-error' : 'inactive'}`}
+        title={track.mute ? 'Activer' : 'Muter'}
+      >
+        M
+      </button>
+
+      {/* Solo button */}
+      <button
+        onClick={() => updateAudioTrack(index, { solo: !track.solo })}
+        className={`toggle-btn ${track.solo ? 'active bg-accent-warning' : 'inactive'}`}
+        title={track.solo ? 'Desactiver solo' : 'Solo'}
+      >
+        S
+      </button>
+
+      <button
+        onClick={() => removeAudioTrack(index)}
+        className="opacity-0 group-hover:opacity-100 text-gray-400 hover:text-accent-error transition-opacity"
+      >
+        &#10005;
+      </button>
+    </div>
+  );
+});
 
 function AudioPanel() {
-  const {
-    audioTracks,
-    addAudioTracks,
-    removeAudioTrack,
-    updateAudioTrack,
-    moveAudioTrack,
-    clearAudioTracks,
-    setStatusMessage,
-  } = useStore();
+  const { audioTracks, isDraggingFiles, addAudioTracks, clearAudioTracks, setStatusMessage } = useStore(
+    useShallow((s) => ({
+      audioTracks: s.audioTracks,
+      isDraggingFiles: s.isDraggingFiles,
+      addAudioTracks: s.addAudioTracks,
+      clearAudioTracks: s.clearAudioTracks,
+      setStatusMessage: s.setStatusMessage,
+    }))
+  );
 
   const handleAddTracks = async () => {
     try {
       const paths = await open({
         multiple: true,
-        filters: [
-          {
-            name: 'Fichiers audio',
-            extensions: SUPPORTED_AUDIO_EXTENSIONS.map((e) => e.slice(1)),
-          },
-        ],
+        filters: audioFilters,
       });
       if (paths && Array.isArray(paths)) {
         await addAudioTracks(paths);
@@ -35,41 +170,6 @@ function AudioPanel() {
     }
   };
 
-  const handleDrop = useCallback(
-    async (e: React.DragEvent) => {
-      e.preventDefault();
-      const files = Array.from(e.dataTransfer.files);
-      const audioPaths = files
-        .filter((f) => SUPPORTED_AUDIO_EXTENSIONS.some((ext) => f.name.toLowerCase().endsWith(ext)))
-        .map((f) => f.path);
-      if (audioPaths.length > 0) {
-        await addAudioTracks(audioPaths);
-      }
-    },
-    [addAudioTracks]
-  );
-
-  const handleDragOver = (e: React.DragEvent) => {
-    e.preventDefault();
-    e.currentTarget.classList.add('active');
-  };
-
-  const handleDragLeave = (e: React.DragEvent) => {
-    e.currentTarget.classList.remove('active');
-  };
-
-  const handleMoveUp = (index: number) => {
-    if (index > 0) {
-      moveAudioTrack(index, index - 1);
-    }
-  };
-
-  const handleMoveDown = (index: number) => {
-    if (index < audioTracks.length - 1) {
-      moveAudioTrack(index, index + 1);
-    }
-  };
-
   const totalDuration = getMusicDuration(audioTracks);
 
   return (
@@ -90,100 +190,24 @@ function AudioPanel() {
       </div>
 
       {audioTracks.length === 0 ? (
-        <div
-          className="drop-zone flex-1 flex items-center justify-center"
-          onDrop={handleDrop}
-          onDragOver={handleDragOver}
-          onDragLeave={handleDragLeave}
-        >
+        <div className={`drop-zone flex-1 flex items-center justify-center ${isDraggingFiles ? 'active' : ''}`}>
           <div className="text-center">
             <div className="text-4xl mb-2 opacity-50">&#127925;</div>
             <p className="text-gray-400">Glissez des fichiers audio ici ou cliquez sur Ajouter</p>
             <p className="text-sm text-gray-500 mt-1">
-              Formats: {SUPPORTED_AUDIO_EXTENSIONS.join(', ')}
+              Formats: {audioFormats}
             </p>
           </div>
         </div>
       ) : (
-        <div
-          className="media-list flex-1"
-          onDrop={handleDrop}
-          onDragOver={handleDragOver}
-          onDragLeave={handleDragLeave}
-        >
+        <div className="media-list flex-1">
           {audioTracks.map((track, index) => (
-            <div
-              key={`${track.path}-${index}`}
-              className={`media-item group ${track.mute ? 'opacity-50' : ''}`}
-            >
-              <div className="flex flex-col gap-1">
-                <button
-                  onClick={() => handleMoveUp(index)}
-                  disabled={index === 0}
-                  className="text-gray-500 hover:text-white disabled:opacity-30 text-xs"
-                >
-                  &#9650;
-                </button>
-                <button
-                  onClick={() => handleMoveDown(index)}
-                  disabled={index === audioTracks.length - 1}
-                  className="text-gray-500 hover:text-white disabled:opacity-30 text-xs"
-                >
-                  &#9660;
-                </button>
-              </div>
-
-              <div className="w-8 h-8 bg-accent-success/20 rounded flex items-center justify-center text-accent-success">
-                &#9835;
-              </div>
-
-              <div className="flex-1 min-w-0">
-                <p className="text-sm font-medium truncate">{track.name}</p>
-                <p className="text-xs text-gray-400">{formatDuration(track.duration)}</p>
-              </div>
-
-              {/* Volume slider */}
-              <div className="flex items-center gap-2 w-32">
-                <input
-                  type="range"
-                  min="0"
-                  max="110"
-                  value={track.volume * 100}
-                  onChange={(e) =>
-                    updateAudioTrack(index, { volume: parseInt(e.target.value) / 100 })
-                  }
-                  className="slider flex-1"
-                />
-                <span className="text-xs text-gray-400 w-8">
-                  {Math.round(track.volume * 100)}%
-                </span>
-              </div>
-
-              {/* Mute button */}
-              <button
-                onClick={() => updateAudioTrack(index, { mute: !track.mute })}
-                className={`toggle-btn ${track.mute ? 'active bg-accent-error' : 'inactive'}`}
-                title={track.mute ? 'Activer' : 'Muter'}
-              >
-                M
-              </button>
-
-              {/* Solo button */}
-              <button
-                onClick={() => updateAudioTrack(index, { solo: !track.solo })}
-                className={`toggle-btn ${track.solo ? 'active bg-accent-warning' : 'inactive'}`}
-                title={track.solo ? 'Desactiver solo' : 'Solo'}
-              >
-                S
-              </button>
-
-              <button
-                onClick={() => removeAudioTrack(index)}
-                className="opacity-0 group-hover:opacity-100 text-gray-400 hover:text-accent-error transition-opacity"
-              >
-                &#10005;
-              </button>
-            </div>
+            <AudioTrackItem
+              key={getItemKey(track)}
+              track={track}
+              index={index}
+              isLast={index === audioTracks.length - 1}
+            />
           ))}
         </div>
       )}
@@ -1,5 +1,6 @@
 import { useState } from 'react';
 import { save } from '@tauri-apps/plugin-dialog';
+import { useShallow } from 'zustand/react/shallow';
 import { useStore } from '../store/useStore';
 import { getVideoDuration, formatDuration } from '../types';
 
@@ -10,25 +11,37 @@ const formatInfo: Record<OutputFormat, { label: string; description: string }> =
   mp4: { label: 'MP4', description: 'Compatible partout' },
   webm: { label: 'WebM', description: 'Pour le web' },
 };
+const outputFormats = Object.keys(formatInfo) as OutputFormat[];
 
 function ExportPanel() {
   const {
-    videos,
-    settings,
+    hasVideos,
+    totalDuration,
     isExporting,
     exportProgress,
     isGeneratingPreview,
     startExport,
     cancelExport,
-    generatePreview,
     playPreview,
     setStatusMessage,
-  } = useStore();
+  } = useStore(
+    useShallow((s) => ({
+      // Derived primitives: reordering clips or editing unrelated settings leaves the panel alone
+      hasVideos: s.videos.length > 0,
+      totalDuration: getVideoDuration(s.videos, s.settings.video_crossfade),
+      isExporting: s.isExporting,
+      exportProgress: s.exportProgress,
+      isGeneratingPreview: s.isGeneratingPreview,
+      startExport: s.startExport,
+      cancelExport: s.cancelExport,
+      playPreview: s.playPreview,
+      setStatusMessage: s.setStatusMessage,
+    }))
+  );
 
   const [outputFormat, setOutputFormat] = useState<OutputFormat>('mkv');
 
-  const totalDuration = getVideoDuration(videos, settings.video_crossfade);
-  const canExport = videos.length > 0 && !isExporting && !isGeneratingPreview;
+  const canExport = hasVideos && !isExporting && !isGeneratingPreview;
 
   const handleExport = async () => {
     try {
@@ -38,34 +51,18 @@ function ExportPanel() {
       });
 
       if (path) {
-        const result = await startExport(path);
-        if (result.success) {
-          setStatusMessage(
-            `Export termine en ${result.duration_seconds.toFixed(1)}s (${result.encoder})`
-          );
-        } else if (result.cancelled) {
-          setStatusMessage('Export annule');
-        } else {
-          setStatusMessage(`Erreur: ${result.error}`);
-        }
+        await startExport(path);
       }
     } catch (error) {
       setStatusMessage(`Erreur: ${error}`);
     }
   };
 
-  const handlePreview = async (fullLength: boolean) => {
-    const path = await generatePreview(fullLength);
-    if (path) {
-      await playPreview(path);
-    }
-  };
-
   return (
     <div className="card flex flex-col">
       <h2 className="text-lg font-semibold mb-4">Export</h2>
 
-      {videos.length === 0 ? (
+      {!hasVideos ? (
         <div className="flex-1 flex items-center justify-center text-gray-400">
           <p>Ajoutez des videos pour exporter</p>
         </div>
@@ -83,7 +80,7 @@ function ExportPanel() {
           <div>
             <label className="text-sm block mb-2">Format de sortie</label>
             <div className="grid grid-cols-3 gap-2">
-              {(Object.keys(formatInfo) as OutputFormat[]).map((format) => (
+              {outputFormats.map((format) => (
                 <button
                   key={format}
                   onClick={() => setOutputFormat(format)}
@@ -103,14 +100,14 @@ function ExportPanel() {
           {/* Preview buttons */}
           <div className="grid grid-cols-2 gap-2">
             <button
-              onClick={() => handlePreview(false)}
+              onClick={() => playPreview(false)}
               disabled={!canExport}
               className="btn btn-secondary"
             >
               {isGeneratingPreview ? 'Generation...' : 'Preview 60s'}
             </button>
             <button
-              onClick={() => handlePreview(true)}
+              onClick={() => playPreview(true)}
               disabled={!canExport}
               className="btn btn-secondary"
             >
@@ -128,7 +125,7 @@ function ExportPanel() {
               <div className="progress-bar">
                 <div
                   className="progress-bar-fill"
-                  style={{ width: `${exportProgress}%` }}
+                  style={{ transform: `scaleX(${exportProgress / 100})` }}
                 />
               </div>
               <button onClick={cancelExport} className="btn btn-danger w-full">
@@ -1,5 +1,9 @@
 import { open, save } from '@tauri-apps/plugin-dialog';
+import { useShallow } from 'zustand/react/shallow';
 import { useStore } from '../store/useStore';
+import { getBaseName } from '../types';
+
+const projectFilters = [{ name: 'Projets Video-Musique', extensions: ['mixproj'] }];
 
 function Header() {
   const {
@@ -9,7 +13,16 @@ function Header() {
     currentProjectPath,
     hasUnsavedChanges,
     setStatusMessage,
-  } = useStore();
+  } = useStore(
+    useShallow((s) => ({
+      newProject: s.newProject,
+      saveProject: s.saveProject,
+      loadProject: s.loadProject,
+      currentProjectPath: s.currentProjectPath,
+      hasUnsavedChanges: s.hasUnsavedChanges,
+      setStatusMessage: s.setStatusMessage,
+    }))
+  );
 
   const handleNew = async () => {
     if (hasUnsavedChanges) {
@@ -24,7 +37,7 @@ function Header() {
   const handleOpen = async () => {
     try {
       const path = await open({
-        filters: [{ name: 'Projets Video-Musique', extensions: ['mixproj'] }],
+        filters: projectFilters,
       });
       if (path) {
         await loadProject(path as string);
@@ -49,7 +62,7 @@ function Header() {
   const handleSaveAs = async () => {
     try {
       const path = await save({
-        filters: [{ name: 'Projets Video-Musique', extensions: ['mixproj'] }],
+        filters: projectFilters,
         defaultPath: 'projet.mixproj',
       });
       if (path) {
@@ -61,7 +74,7 @@ function Header() {
   };
 
   const projectName = currentProjectPath
-    ? currentProjectPath.split('/').pop()?.split('\\').pop() || 'Projet'
+    ? getBaseName(currentProjectPath) || 'Projet'
     : 'Nouveau projet';
 
   return (
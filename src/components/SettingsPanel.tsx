@@ -1,14 +1,59 @@
+import { useCallback, useEffect, useRef, useState } from 'react';
+import { useShallow } from 'zustand/react/shallow';
 import { useStore } from '../store/useStore';
-import type { SpeedPreset } from '../types';
+import type { ProjectSettings, SpeedPreset } from '../types';
+
+const SLIDER_COMMIT_DELAY_MS = 150;
+
+const speedPresetLabels: Record<SpeedPreset, string> = {
+  ultrafast: 'Ultra-rapide',
+  fast: 'Rapide',
+  balanced: 'Equilibre',
+  quality: 'Qualite',
+};
+const speedPresets = Object.keys(speedPresetLabels) as SpeedPreset[];
 
 function SettingsPanel() {
-  const { settings, updateSettings, gpuInfo } = useStore();
+  const {
+    settings,
+    updateSettings,
+    gpuInfo,
+  } = useStore(
+    useShallow((s) => ({
+      settings: s.settings,
+      updateSettings: s.updateSettings,
+      gpuInfo: s.gpuInfo,
+    }))
+  );
 
-  const speedPresetLabels: Record<SpeedPreset, string> = {
-    ultrafast: 'Ultra-rapide',
-    fast: 'Rapide',
-    balanced: 'Equilibre',
-    quality: 'Qualite',
+  // Sliders fire on every pixel: show the value at once, commit to the store once the drag settles
+  const [draft, setDraft] = useState<ProjectSettings>(settings);
+  const pending = useRef<Partial<ProjectSettings>>({});
+  const commitTimer = useRef<ReturnType<typeof setTimeout> | null>(null);
+
+  useEffect(() => {
+    setDraft({ ...settings, ...pending.current });
+  }, [settings]);
+
+  const commitPending = useCallback(() => {
+    if (commitTimer.current) {
+      clearTimeout(commitTimer.current);
+      commitTimer.current = null;
+    }
+    const updates = pending.current;
+    pending.current = {};
+    if (Object.keys(updates).length > 0) {
+      updateSettings(updates);
+    }
+  }, [updateSettings]);
+
+  useEffect(() => commitPending, [commitPending]);
+
+  const updateSlider = (updates: Partial<ProjectSettings>) => {
+    setDraft((current) => ({ ...current, ...updates }));
+    pending.current = { ...pending.current, ...updates };
+    if (commitTimer.current) clearTimeout(commitTimer.current);
+    commitTimer.current = setTimeout(commitPending, SLIDER_COMMIT_DELAY_MS);
   };
 
   return (
@@ -23,7 +68,7 @@ function SettingsPanel() {
           <label className="flex items-center gap-3 cursor-pointer">
             <input
               type="checkbox"
-              checked={settings.include_video_audio}
+              checked={draft.include_video_audio}
               onChange={(e) => updateSettings({ include_video_audio: e.target.checked })}
               className="w-4 h-4 rounded bg-dark-500 border-dark-200 text-primary-500 focus:ring-primary-500"
             />
@@ -33,7 +78,7 @@ function SettingsPanel() {
           <label className="flex items-center gap-3 cursor-pointer">
             <input
               type="checkbox"
-              checked={settings.include_music}
+              checked={draft.include_music}
               onChange={(e) => updateSettings({ include_music: e.target.checked })}
               className="w-4 h-4 rounded bg-dark-500 border-dark-200 text-primary-500 focus:ring-primary-500"
             />
@@ -43,7 +88,7 @@ function SettingsPanel() {
           <label className="flex items-center gap-3 cursor-pointer">
             <input
               type="checkbox"
-              checked={settings.cut_music_at_end}
+              checked={draft.cut_music_at_end}
               onChange={(e) => updateSettings({ cut_music_at_end: e.target.checked })}
               className="w-4 h-4 rounded bg-dark-500 border-dark-200 text-primary-500 focus:ring-primary-500"
             />
@@ -58,14 +103,15 @@ function SettingsPanel() {
           <div>
             <div className="flex justify-between text-sm mb-1">
               <span>Volume video</span>
-              <span className="text-gray-400">{Math.round(settings.video_volume)}%</span>
+              <span className="text-gray-400">{Math.round(draft.video_volume)}%</span>
             </div>
             <input
               type="range"
               min="0"
               max="110"
-              value={settings.video_volume}
-              onChange={(e) => updateSettings({ video_volume: parseInt(e.target.value) })}
+              value={draft.video_volume}
+              onChange={(e) => updateSlider({ video_volume: e.target.valueAsNumber })}
+              onPointerUp={commitPending}
               className="slider"
             />
           </div>
@@ -73,14 +119,15 @@ function SettingsPanel() {
           <div>
             <div className="flex justify-between text-sm mb-1">
               <span>Volume musique</span>
-              <span className="text-gray-400">{Math.round(settings.music_volume)}%</span>
+              <span className="text-gray-400">{Math.round(draft.music_volume)}%</span>
             </div>
             <input
               type="range"
               min="0"
               max="110"
-              value={settings.music_volume}
-              onChange={(e) => updateSettings({ music_volume: parseInt(e.target.value) })}
+              value={draft.music_volume}
+              onChange={(e) => updateSlider({ music_volume: e.target.valueAsNumber })}
+              onPointerUp={commitPending}
               className="slider"
             />
           </div>
@@ -95,15 +142,16 @@ function SettingsPanel() {
           <div>
             <div className="flex justify-between text-sm mb-1">
               <span>Fondu video</span>
-              <span className="text-gray-400">{settings.video_crossfade.toFixed(1)}s</span>
+              <span className="text-gray-400">{draft.video_crossfade.toFixed(1)}s</span>
             </div>
             <input
               type="range"
               min="0"
               max="5"
               step="0.1"
-              value={settings.video_crossfade}
-              onChange={(e) => updateSettings({ video_crossfade: parseFloat(e.target.value) })}
+              value={draft.video_crossfade}
+              onChange={(e) => updateSlider({ video_crossfade: e.target.valueAsNumber })}
+              onPointerUp={commitPending}
               className="slider"
             />
           </div>
@@ -111,14 +159,15 @@ function SettingsPanel() {
           <div>
             <div className="flex justify-between text-sm mb-1">
               <span>Fondu audio</span>
-              <span className="text-gray-400">{Math.round(settings.audio_crossfade)}s</span>
+              <span className="text-gray-400">{Math.round(draft.audio_crossfade)}s</span>
             </div>
             <input
               type="range"
               min="1"
               max="20"
-              value={settings.audio_crossfade}
-              onChange={(e) => updateSettings({ audio_crossfade: parseInt(e.target.value) })}
+              value={draft.audio_crossfade}
+              onChange={(e) => updateSlider({ audio_crossfade: e.target.valueAsNumber })}
+              onPointerUp={commitPending}
               className="slider"
             />
           </div>
@@ -133,7 +182,7 @@ function SettingsPanel() {
           <label className="flex items-center gap-3 cursor-pointer">
             <input
               type="checkbox"
-              checked={settings.use_gpu}
+              checked={draft.use_gpu}
               onChange={(e) => updateSettings({ use_gpu: e.target.checked })}
               className="w-4 h-4 rounded bg-dark-500 border-dark-200 text-primary-500 focus:ring-primary-500"
             />
@@ -147,17 +196,18 @@ function SettingsPanel() {
               {gpuInfo && !gpuInfo.available && (
                 <span className="text-gray-500 text-xs ml-2">(Non disponible)</span>
               )}
+              {!gpuInfo && <span className="text-gray-500 text-xs ml-2">(Detection...)</span>}
             </span>
           </label>
 
           <div>
             <label className="text-sm block mb-2">Preset de vitesse</label>
             <select
-              value={settings.speed_preset}
+              value={draft.speed_preset}
               onChange={(e) => updateSettings({ speed_preset: e.target.value as SpeedPreset })}
               className="input w-full"
             >
-              {(Object.keys(speedPresetLabels) as SpeedPreset[]).map((preset) => (
+              {speedPresets.map((preset) => (
                 <option key={preset} value={preset}>
                   {speedPresetLabels[preset]}
                 </option>
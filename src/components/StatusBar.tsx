@@ -1,7 +1,23 @@
+import { useShallow } from 'zustand/react/shallow';
 import { useStore } from '../store/useStore';
 
 function StatusBar() {
-  const { statusMessage, gpuInfo, dependencies, videos, audioTracks } = useStore();
+  const {
+    statusMessage,
+    gpuInfo,
+    dependencies,
+    videoCount,
+    trackCount,
+  } = useStore(
+    useShallow((s) => ({
+      statusMessage: s.statusMessage,
+      gpuInfo: s.gpuInfo,
+      dependencies: s.dependencies,
+      // Counts, not the lists: track edits that keep the count leave the bar alone
+      videoCount: s.videos.length,
+      trackCount: s.audioTracks.length,
+    }))
+  );
 
   return (
     <footer className="bg-dark-500 border-t border-dark-200 px-4 py-2">
@@ -14,8 +30,8 @@ function StatusBar() {
         <div className="flex items-center gap-4">
           {/* Media count */}
           <span className="text-gray-500">
-            {videos.length} video{videos.length !== 1 ? 's' : ''} | {audioTracks.length} piste
-            {audioTracks.length !== 1 ? 's' : ''} audio
+            {videoCount} video{videoCount !== 1 ? 's' : ''} | {trackCount} piste
+            {trackCount !== 1 ? 's' : ''} audio
           </span>
 
           {/* GPU status */}
@@ -1,22 +1,91 @@
-import { useCallback } from 'react';
+import { memo } from 'react';
 import { open } from '@tauri-apps/plugin-dialog';
+import { useShallow } from 'zustand/react/shallow';
 import { useStore } from '../store/useStore';
-import { formatDuration, getVideoDuration, SUPPORTED_VIDEO_EXTENSIONS } from '../types';
+import {
+  formatDuration,
+  getItemKey,
+  getVideoDuration,
+  SUPPORTED_VIDEO_EXTENSIONS,
+  VideoClip,
+} from '../types';
+
+const videoFilters = [
+  {
+    name: 'Fichiers video',
+    extensions: SUPPORTED_VIDEO_EXTENSIONS.map((e) => e.slice(1)),
+  },
+];
+const videoFormats = SUPPORTED_VIDEO_EXTENSIONS.join(', ');
+
+interface VideoItemProps {
+  video: VideoClip;
+  index: number;
+  isLast: boolean;
+}
+
+// Memoized: adding, removing or moving a clip only re-renders the rows whose props changed
+const VideoItem = memo(function VideoItem({ video, index, isLast }: VideoItemProps) {
+  const { removeVideo, moveVideo } = useStore(
+    useShallow((s) => ({ removeVideo: s.removeVideo, moveVideo: s.moveVideo }))
+  );
+
+  return (
+    <div className="media-item group">
+      <div className="flex flex-col gap-1">
+        <button
+          onClick={() => moveVideo(index, index - 1)}
+          disabled={index === 0}
+          className="text-gray-500 hover:text-white disabled:opacity-30 text-xs"
+        >
+          &#9650;
+        </button>
+        <button
+          onClick={() => moveVideo(index, index + 1)}
+          disabled={isLast}
+          className="text-gray-500 hover:text-white disabled:opacity-30 text-xs"
+        >
+          &#9660;
+        </button>
+      </div>
+
+      <div className="w-8 h-8 bg-primary-500/20 rounded flex items-center justify-center text-primary-500">
+        {index + 1}
+      </div>
+
+      <div className="flex-1 min-w-0">
+        <p className="text-sm font-medium truncate">{video.name}</p>
+        <p className="text-xs text-gray-400">{formatDuration(video.duration)}</p>
+      </div>
+
+      <button
+        onClick={() => removeVideo(index)}
+        className="opacity-0 group-hover:opacity-100 text-gray-400 hover:text-accent-error transition-opacity"
+      >
+        &#10005;
+      </button>
+    </div>
+  );
+});
 
 function VideoPanel() {
-  const { videos, addVideos, removeVideo, moveVideo, clearVideos, settings, setStatusMessage } =
-    useStore();
+  // The total is selected rather than the settings: volume or checkbox edits don't re-render the list
+  const { videos, totalDuration, isDraggingFiles, addVideos, clearVideos, setStatusMessage } = useStore(
+    useShallow((s) => ({
+      videos: s.videos,
+      totalDuration: getVideoDuration(s.videos, s.settings.video_crossfade),
+      isDraggingFiles: s.isDraggingFiles,
+      addVideos: s.addVideos,
+      clearVideos: s.clearVideos,
+      setStatusMessage: s.setStatusMessage,
+    }))
+  );
 
   const handleAddVideos = async () => {
     try {
       const paths = await open({
         multiple: true,
-        filters: [
-          {
-            name: 'Fichiers video',
-            extensions: SUPPORTED_VIDEO_EXTENSIONS.map((e) => e.slice(1)),
-          },
-        ],
+        filters: videoFilters,
       });
       if (paths && Array.isArray(paths)) {
         await addVideos(paths);
@@ -28,43 +97,6 @@ function VideoPanel() {
     }
   };
 
-  const handleDrop = useCallback(
-    async (e: React.DragEvent) => {
-      e.preventDefault();
-      const files = Array.from(e.dataTransfer.files);
-      const videoPaths = files
-        .filter((f) => SUPPORTED_VIDEO_EXTENSIONS.some((ext) => f.name.toLowerCase().endsWith(ext)))
-        .map((f) => f.path);
-      if (videoPaths.length > 0) {
-        await addVideos(videoPaths);
-      }
-    },
-    [addVideos]
-  );
-
-  const handleDragOver = (e: React.DragEvent) => {
-    e.preventDefault();
-    e.currentTarget.classList.add('active');
-  };
-
-  const handleDragLeave = (e: React.DragEvent) => {
-    e.currentTarget.classList.remove('active');
-  };
-
-  const handleMoveUp = (index: number) => {
-    if (index > 0) {
-      moveVideo(index, index - 1);
-    }
-  };
-
-  const handleMoveDown = (index: number) => {
-    if (index < videos.length - 1) {
-      moveVideo(index, index + 1);
-    }
-  };
-
-  const totalDuration = getVideoDuration(videos, settings.video_crossfade);
-
   return (
     <div className="card flex-1 flex flex-col overflow-hidden">
       <div className="flex items-center justify-between mb-3">
@@ -83,62 +115,24 @@ function VideoPanel() {
       </div>
 
       {videos.length === 0 ? (
-        <div
-          className="drop-zone flex-1 flex items-center justify-center"
-          onDrop={handleDrop}
-          onDragOver={handleDragOver}
-          onDragLeave={handleDragLeave}
-        >
+        <div className={`drop-zone flex-1 flex items-center justify-center ${isDraggingFiles ? 'active' : ''}`}>
           <div className="text-center">
             <div className="text-4xl mb-2 opacity-50">&#128249;</div>
             <p className="text-gray-400">Glissez des videos ici ou cliquez sur Ajouter</p>
             <p className="text-sm text-gray-500 mt-1">
-              Formats: {SUPPORTED_VIDEO_EXTENSIONS.join(', ')}
+              Formats: {videoFormats}
             </p>
           </div>
         </div>
       ) : (
-        <div
-          className="media-list flex-1"
-          onDrop={handleDrop}
-          onDragOver={handleDragOver}
-          onDragLeave={handleDragLeave}
-        >
+        <div className="media-list flex-1">
           {videos.map((video, index) => (
-            <div key={`${video.path}-${index}`} className="media-item group">
-              <div className="flex flex-col gap-1">
-                <button
-                  onClick={() => handleMoveUp(index)}
-                  disabled={index === 0}
-                  className="text-gray-500 hover:text-white disabled:opacity-30 text-xs"
-                >
-                  &#9650;
-                </button>
-                <button
-                  onClick={() => handleMoveDown(index)}
-                  disabled={index === videos.length - 1}
-                  className="text-gray-500 hover:text-white disabled:opacity-30 text-xs"
-                >
-                  &#9660;
-                </button>
-              </div>
-
-              <div className="w-8 h-8 bg-primary-500/20 rounded flex items-center justify-center text-primary-500">
-                {index + 1}
-              </div>
-
-              <div className="flex-1 min-w-0">
-                <p className="text-sm font-medium truncate">{video.name}</p>
-                <p className="text-xs text-gray-400">{formatDuration(video.duration)}</p>
-              </div>
-
-              <button
-                onClick={() => removeVideo(index)}
-                className="opacity-0 group-hover:opacity-100 text-gray-400 hover:text-accent-error transition-opacity"
-              >
-                &#10005;
-              </button>
-            </div>
+            <VideoItem
+              key={getItemKey(video)}
+              video={video}
+              index={index}
+              isLast={index === videos.length - 1}
+            />
           ))}
         </div>
       )}
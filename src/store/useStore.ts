@@ -11,19 +11,54 @@ import {
   DEFAULT_SETTINGS,
   createAudioTrack,
   createVideoClip,
+  getMediaKind,
+  withItemKey,
 } from '../types';
 
+// Shared empty lists: the store never mutates arrays in place, so these are safe to reuse
+const NO_VIDEOS: VideoClip[] = [];
+const NO_AUDIO_TRACKS: AudioTrack[] = [];
+
+// Entries saved without a duration are probed together in a single call
+async function fillMissingDurations(project: Project): Promise<void> {
+  const missing = [...project.videos, ...project.audio_tracks].filter((m) => m.duration <= 0);
+  if (missing.length === 0) return;
+
+  const durations = await invoke<number[]>('get_durations_parallel', {
+    paths: missing.map((m) => m.path),
+  });
+  missing.forEach((m, i) => {
+    m.duration = durations[i];
+  });
+}
+
+// Paths already in the list reuse their known duration; only new files are sent to be probed
+async function getDurations(paths: string[], known: (VideoClip | AudioTrack)[]): Promise<number[]> {
+  const knownDurations = new Map<string, number>();
+  for (const item of known) {
+    if (item.duration > 0) knownDurations.set(item.path, item.duration);
+  }
+  const unknown = paths.filter((path) => !knownDurations.has(path));
+  if (unknown.length > 0) {
+    const durations = await invoke<number[]>('get_durations_parallel', { paths: unknown });
+    unknown.forEach((path, i) => knownDurations.set(path, durations[i]));
+  }
+  return paths.map((path) => knownDurations.get(path) ?? 0);
+}
+
 interface AppState {
   // Media
   videos: VideoClip[];
   audioTracks: AudioTrack[];
-  settings: ProjectSettings;
+  // Replaced, never mutated: derived values can be memoized on identity
+  settings: Readonly<ProjectSettings>;
 
   // Status
   isExporting: boolean;
   exportProgress: number;
   isGeneratingPreview: boolean;
   statusMessage: string;
+  isDraggingFiles: boolean;
 
   // GPU Info
   gpuInfo: GpuInfo | null;
@@ -46,17 +81,19 @@ interface AppState {
   moveAudioTrack: (fromIndex: number, toIndex: number) => void;
   clearAudioTracks: () => void;
 
+  // Actions - Media
+  addMediaFiles: (paths: string[]) => Promise<void>;
+
   // Actions - Settings
   updateSettings: (updates: Partial<ProjectSettings>) => void;
 
   // Actions - Export
-  startExport: (outputPath: string) => Promise<ExportResult>;
+  startExport: (outputPath: string) => Promise<ExportResult | null>;
   cancelExport: () => void;
   setExportProgress: (progress: number) => void;
 
   // Actions - Preview
-  generatePreview: (fullLength?: boolean) => Promise<string | null>;
-  playPreview: (path: string) => Promise<void>;
+  playPreview: (fullLength?: boolean) => Promise<void>;
 
   // Actions - Project
   newProject: () => void;
@@ -68,17 +105,24 @@ interface AppState {
   checkDependencies: () => Promise<void>;
   detectGpu: () => Promise<void>;
   setStatusMessage: (message: string) => void;
+  setDraggingFiles: (dragging: boolean) => void;
+}
+
+// The shape the backend commands take, read from a single store snapshot
+function toProject({ videos, audioTracks, settings }: AppState): Project {
+  return { videos, audio_tracks: audioTracks, settings };
 }
 
 export const useStore = create<AppState>((set, get) => ({
   // Initial state
-  videos: [],
-  audioTracks: [],
+  videos: NO_VIDEOS,
+  audioTracks: NO_AUDIO_TRACKS,
   settings: DEFAULT_SETTINGS,
   isExporting: false,
   exportProgress: 0,
   isGeneratingPreview: false,
   statusMessage: '',
+  isDraggingFiles: false,
   gpuInfo: null,
   dependencies: null,
   currentProjectPath: null,
@@ -87,7 +131,7 @@ export const useStore = create<AppState>((set, get) => ({
   // Videos
   addVideos: async (paths) => {
     try {
-      const durations = await invoke<number[]>('get_durations_parallel', { paths });
+      const durations = await getDurations(paths, get().videos);
       const newVideos = paths.map((path, i) => createVideoClip(path, durations[i]));
       set((state) => ({
         videos: [...state.videos, ...newVideos],
@@ -114,12 +158,12 @@ export const useStore = create<AppState>((set, get) => ({
     });
   },
 
-  clearVideos: () => set({ videos: [], hasUnsavedChanges: true }),
+  clearVideos: () => set({ videos: NO_VIDEOS, hasUnsavedChanges: true }),
 
   // Audio
   addAudioTracks: async (paths) => {
     try {
-      const durations = await invoke<number[]>('get_durations_parallel', { paths });
+      const durations = await getDurations(paths, get().audioTracks);
       const newTracks = paths.map((path, i) => createAudioTrack(path, durations[i]));
       set((state) => ({
         audioTracks: [...state.audioTracks, ...newTracks],
@@ -137,13 +181,17 @@ export const useStore = create<AppState>((set, get) => ({
     }));
   },
 
+  // Only the edited entry is copied; a no-op edit leaves the list (and its subscribers) untouched
   updateAudioTrack: (index, updates) => {
-    set((state) => ({
-      audioTracks: state.audioTracks.map((track, i) =>
-        i === index ? { ...track, ...updates } : track
-      ),
-      hasUnsavedChanges: true,
-    }));
+    set((state) => {
+      const track = state.audioTracks[index];
+      const keys = Object.keys(updates) as (keyof AudioTrack)[];
+      if (!track || keys.every((key) => track[key] === updates[key])) return state;
+
+      const audioTracks = state.audioTracks.slice();
+      audioTracks[index] = withItemKey(track, { ...track, ...updates });
+      return { audioTracks, hasUnsavedChanges: true };
+    });
   },
 
   moveAudioTrack: (fromIndex, toIndex) => {
@@ -155,7 +203,27 @@ export const useStore = create<AppState>((set, get) => ({
     });
   },
 
-  clearAudioTracks: () => set({ audioTracks: [], hasUnsavedChanges: true }),
+  clearAudioTracks: () => set({ audioTracks: NO_AUDIO_TRACKS, hasUnsavedChanges: true }),
+
+  // Media (dropped files): sorted by kind, then probed once per kind
+  addMediaFiles: async (paths) => {
+    const videoPaths: string[] = [];
+    const audioPaths: string[] = [];
+    for (const path of paths) {
+      const kind = getMediaKind(path);
+      if (kind === 'video') videoPaths.push(path);
+      else if (kind === 'audio') audioPaths.push(path);
+    }
+    if (videoPaths.length === 0 && audioPaths.length === 0) return;
+
+    set({ statusMessage: 'Analyse des fichiers...' });
+    const { addVideos, addAudioTracks } = get();
+    await Promise.all([
+      videoPaths.length > 0 && addVideos(videoPaths),
+      audioPaths.length > 0 && addAudioTracks(audioPaths),
+    ]);
+    set({ statusMessage: '' });
+  },
 
   // Settings
   updateSettings: (updates) => {
@@ -167,28 +235,30 @@ export const useStore = create<AppState>((set, get) => ({
 
   // Export
   startExport: async (outputPath) => {
-    const { videos, audioTracks, settings } = get();
+    const project = toProject(get());
     set({ isExporting: true, exportProgress: 0, statusMessage: 'Export en cours...' });
 
     try {
-      const project: Project = { videos, audio_tracks: audioTracks, settings };
       const result = await invoke<ExportResult>('export_project', {
         project,
         outputPath,
-        useGpu: settings.use_gpu,
-        speedPreset: settings.speed_preset,
+        useGpu: project.settings.use_gpu,
+        speedPreset: project.settings.speed_preset,
       });
 
-      set({
-        isExporting: false,
-        exportProgress: 100,
-        statusMessage: result.success ? 'Export termine!' : (result.error || 'Erreur'),
-      });
+      // The whole outcome lands in one update: a single render when the export ends
+      let statusMessage = `Erreur: ${result.error || 'inconnue'}`;
+      if (result.success) {
+        statusMessage = `Export termine en ${result.duration_seconds.toFixed(1)}s (${result.encoder})`;
+      } else if (result.cancelled) {
+        statusMessage = 'Export annule';
+      }
+      set({ isExporting: false, exportProgress: 100, statusMessage });
 
       return result;
     } catch (error) {
       set({ isExporting: false, statusMessage: `Erreur: ${error}` });
-      throw error;
+      return null;
     }
   },
 
@@ -197,41 +267,31 @@ export const useStore = create<AppState>((set, get) => ({
     set({ isExporting: false, statusMessage: 'Export annule' });
   },
 
-  setExportProgress: (progress) => set({ exportProgress: progress }),
+  setExportProgress: (progress) => {
+    if (progress !== get().exportProgress) set({ exportProgress: progress });
+  },
 
-  // Preview
-  generatePreview: async (fullLength = false) => {
-    const { videos, audioTracks, settings } = get();
+  // Preview: streamed straight into ffplay, so playback starts while it is still encoding
+  playPreview: async (fullLength = false) => {
+    const project = toProject(get());
     set({ isGeneratingPreview: true, statusMessage: 'Generation de la preview...' });
 
     try {
-      const project: Project = { videos, audio_tracks: audioTracks, settings };
-      const path = await invoke<string>('create_preview', {
+      await invoke('stream_preview', {
         project,
         clipSeconds: fullLength ? null : 60,
       });
-
-      set({ isGeneratingPreview: false, statusMessage: 'Preview generee' });
-      return path;
+      set({ isGeneratingPreview: false, statusMessage: 'Preview en cours' });
     } catch (error) {
       set({ isGeneratingPreview: false, statusMessage: `Erreur: ${error}` });
-      return null;
-    }
-  },
-
-  playPreview: async (path) => {
-    try {
-      await invoke('play_preview', { path });
-    } catch (error) {
-      console.error('Erreur lors de la lecture:', error);
     }
   },
 
   // Project
   newProject: () => {
     set({
-      videos: [],
-      audioTracks: [],
+      videos: NO_VIDEOS,
+      audioTracks: NO_AUDIO_TRACKS,
       settings: DEFAULT_SETTINGS,
       currentProjectPath: null,
       hasUnsavedChanges: false,
@@ -240,8 +300,7 @@ export const useStore = create<AppState>((set, get) => ({
   },
 
   saveProject: async (path) => {
-    const { videos, audioTracks, settings } = get();
-    const project: Project = { videos, audio_tracks: audioTracks, settings };
+    const project = toProject(get());
 
     try {
       await invoke('save_project', { project, filePath: path });
@@ -259,6 +318,7 @@ export const useStore = create<AppState>((set, get) => ({
   loadProject: async (path) => {
     try {
       const project = await invoke<Project>('load_project', { filePath: path });
+      await fillMissingDurations(project);
       set({
         videos: project.videos,
         audioTracks: project.audio_tracks,
@@ -293,9 +353,15 @@ export const useStore = create<AppState>((set, get) => ({
         set({ statusMessage: `GPU detecte: ${info.gpu_type}` });
       }
     } catch (error) {
+      // Settled as unavailable: the settings panel stops showing detection as pending
+      set({ gpuInfo: { available: false, gpu_type: null, encoder: null } });
       console.error('Erreur lors de la detection GPU:', error);
     }
   },
 
   setStatusMessage: (message) => set({ statusMessage: message }),
+
+  setDraggingFiles: (dragging) => {
+    if (dragging !== get().isDraggingFiles) set({ isDraggingFiles: dragging });
+  },
 }));
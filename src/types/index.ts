@@ -70,7 +70,26 @@ export interface Config {
 export const SUPPORTED_VIDEO_EXTENSIONS = ['.mp4', '.mkv', '.mov', '.avi', '.webm'];
 export const SUPPORTED_AUDIO_EXTENSIONS = ['.mp3', '.wav', '.flac', '.aac', '.ogg'];
 
-export const DEFAULT_SETTINGS: ProjectSettings = {
+// Lowercased extension including the dot, or '' when the file name has none
+function getExtension(path: string): string {
+  const dot = path.lastIndexOf('.');
+  const sep = Math.max(path.lastIndexOf('/'), path.lastIndexOf('\\'));
+  return dot > sep ? path.slice(dot).toLowerCase() : '';
+}
+
+export type MediaKind = 'video' | 'audio';
+
+// One lookup per dropped file: extension to kind
+const MEDIA_KINDS: ReadonlyMap<string, MediaKind> = new Map([
+  ...SUPPORTED_VIDEO_EXTENSIONS.map((ext) => [ext, 'video'] as const),
+  ...SUPPORTED_AUDIO_EXTENSIONS.map((ext) => [ext, 'audio'] as const),
+]);
+
+export function getMediaKind(path: string): MediaKind | null {
+  return MEDIA_KINDS.get(getExtension(path)) ?? null;
+}
+
+export const DEFAULT_SETTINGS: Readonly<ProjectSettings> = Object.freeze({
   include_video_audio: true,
   include_music: true,
   audio_crossfade: 10,
@@ -80,14 +99,36 @@ export const DEFAULT_SETTINGS: ProjectSettings = {
   music_volume: 70,
   use_gpu: true,
   speed_preset: 'balanced',
-};
+});
+
+// Stable React keys for media items: identity based, carried over to edited copies
+const itemKeys = new WeakMap<object, number>();
+let nextItemKey = 0;
+
+export function getItemKey(item: object): number {
+  let key = itemKeys.get(item);
+  if (key === undefined) {
+    key = nextItemKey++;
+    itemKeys.set(item, key);
+  }
+  return key;
+}
+
+export function withItemKey<T extends object>(previous: object, next: T): T {
+  itemKeys.set(next, getItemKey(previous));
+  return next;
+}
+
+export function getBaseName(path: string): string {
+  const sep = Math.max(path.lastIndexOf('/'), path.lastIndexOf('\\'));
+  return path.slice(sep + 1) || path;
+}
 
 export function createAudioTrack(path: string, duration: number = 0): AudioTrack {
-  const name = path.split('/').pop() || path.split('\\').pop() || path;
   return {
     path,
     volume: 1.0,
-    name,
+    name: getBaseName(path),
     duration,
     mute: false,
     solo: false,
@@ -95,44 +136,64 @@ export function createAudioTrack(path: string, duration: number = 0): AudioTrack
 }
 
 export function createVideoClip(path: string, duration: number = 0): VideoClip {
-  const name = path.split('/').pop() || path.split('\\').pop() || path;
   return {
     path,
-    name,
+    name: getBaseName(path),
     duration,
   };
 }
 
+// Audible tracks: not muted, and soloed whenever any track is soloed
 export function getActiveTracks(tracks: AudioTrack[]): AudioTrack[] {
-  if (tracks.length === 0) return [];
-
-  const solos = tracks.filter((t) => t.solo);
-  if (solos.length > 0) {
-    return solos.filter((t) => !t.mute);
-  }
-
-  return tracks.filter((t) => !t.mute);
+  const anySolo = tracks.some((t) => t.solo);
+  return tracks.filter((t) => !t.mute && (t.solo || !anySolo));
 }
 
-export function getVideoDuration(videos: VideoClip[], crossfade: number): number {
-  if (videos.length === 0) return 0;
+// Totals keyed by list identity: the store replaces lists on every edit, so a hit is never stale
+const clipTotals = new WeakMap<VideoClip[], number>();
+const musicTotals = new WeakMap<AudioTrack[], number>();
 
-  const base = videos.reduce((sum, v) => sum + v.duration, 0);
-  const overlap = crossfade * Math.max(videos.length - 1, 0);
-  return Math.max(base - overlap, 0);
+export function getVideoDuration(videos: VideoClip[], crossfade: number): number {
+  const n = videos.length;
+  if (n === 0) return 0;
+
+  let base = clipTotals.get(videos);
+  if (base === undefined) {
+    base = 0;
+    for (let i = 0; i < n; i++) base += videos[i].duration;
+    clipTotals.set(videos, base);
+  }
+  return Math.max(base - crossfade * (n - 1), 0);
 }
 
 export function getMusicDuration(tracks: AudioTrack[]): number {
-  return getActiveTracks(tracks).reduce((sum, t) => sum + t.duration, 0);
+  let total = musicTotals.get(tracks);
+  if (total !== undefined) return total;
+
+  // Same audibility rule as export; the filtered copy is made once per list version
+  total = 0;
+  for (const t of getActiveTracks(tracks)) total += t.duration;
+  musicTotals.set(tracks, total);
+  return total;
 }
 
-export function formatDuration(seconds: number): string {
-  const h = Math.floor(seconds / 3600);
-  const m = Math.floor((seconds % 3600) / 60);
-  const s = Math.floor(seconds % 60);
+// Labels only depend on the whole second, and media lists repeat the same few hundred values
+const durationLabels = new Map<number, string>();
+const MAX_DURATION_LABELS = 1024;
 
-  if (h > 0) {
-    return `${h}:${m.toString().padStart(2, '0')}:${s.toString().padStart(2, '0')}`;
-  }
-  return `${m}:${s.toString().padStart(2, '0')}`;
+export function formatDuration(seconds: number): string {
+  const whole = Math.floor(seconds);
+  const cached = durationLabels.get(whole);
+  if (cached !== undefined) return cached;
+
+  const h = Math.floor(whole / 3600);
+  const m = Math.floor((whole % 3600) / 60);
+  const s = whole % 60;
+
+  const label = h > 0
+    ? `${h}:${m.toString().padStart(2, '0')}:${s.toString().padStart(2, '0')}`
+    : `${m}:${s.toString().padStart(2, '0')}`;
+  if (durationLabels.size >= MAX_DURATION_LABELS) durationLabels.clear();
+  durationLabels.set(whole, label);
+  return label;
 }